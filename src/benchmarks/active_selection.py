@@ -0,0 +1,159 @@
+"""
+Compares the overlap and the expected information gain pair selections of
+TrueSkill by the number of comparisons a simulated annotator needs to reach a
+target Kendall tau, and measures the latency of the information gain
+selection on a large dataset.
+
+Run from the src directory, optionally followed by the dataset sizes:
+
+    python -m benchmarks.active_selection 250 500 1000
+"""
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional
+
+import sorting_algorithms as sa
+import utils.overlap as ovl
+from benchmarks import simulation
+
+DEFAULT_SIZES = [250, 500, 1000]
+
+SELECTIONS = ("overlap", "information")
+
+# The Kendall tau at which a ranking counts as good enough.
+TARGET_TAU = 0.9
+
+# Comparisons per item after which a selection counts as not reaching the
+# target.
+MAX_COMPARISONS_PER_ITEM = 12
+
+# The Kendall tau is measured every n / CHECKS_PER_ITEM comparisons.
+CHECKS_PER_ITEM = 10
+
+# Noise of the simulated annotator on each score.
+NOISE = 0.02
+
+# Size of the dataset on which the latency of the selection is measured.
+LATENCY_SIZE = 10000
+
+
+def timed(sort_alg: sa.TrueSkill, timings: List[float]):
+    """
+    Records the duration of every get_comparison call of an algorithm.
+
+    Args:
+        sort_alg (TrueSkill): The algorithm to time.
+        timings (List[float]): The list receiving the durations in
+                               milliseconds.
+    """
+    get_comparison = sort_alg.get_comparison
+
+    def timed_get_comparison(user_id: str) -> List[str]:
+        start = time.perf_counter()
+        keys = get_comparison(user_id)
+        timings.append((time.perf_counter() - start) * 1000)
+        return keys
+
+    sort_alg.get_comparison = timed_get_comparison
+
+
+def comparisons_to_target(
+        n: int, pair_selection: str) -> Dict[str, Optional[float]]:
+    """
+    Annotates a simulated dataset until the ranking reaches TARGET_TAU.
+
+    Args:
+        n (int): The number of items.
+        pair_selection (str): The pair selection of the TrueSkill object.
+
+    Returns:
+        Dict[str, Optional[float]]: The number of comparisons needed, None if
+                                    the target was not reached, the last
+                                    measured Kendall tau and the median time
+                                    of get_comparison in milliseconds.
+    """
+    scores = simulation.make_scores(n, seed=n)
+    budget = n * MAX_COMPARISONS_PER_ITEM
+    sort_alg = sa.TrueSkill(
+        list(scores), comparison_max=budget,
+        overlap_storage=ovl.default_storage(n), pair_selection=pair_selection)
+
+    timings = []
+    timed(sort_alg, timings)
+
+    step = max(1, n // CHECKS_PER_ITEM)
+    count = 0
+    reached = None
+    tau = 0.0
+
+    while count < budget:
+        performed = simulation.annotate(
+            sort_alg, scores, step, seed=n + count, noise=NOISE)
+        count += performed
+
+        tau = simulation.kendall_tau(sort_alg.get_result(), scores)
+        if tau >= TARGET_TAU:
+            reached = count
+            break
+        if performed < step:
+            break
+
+    return {"comparisons": reached, "tau": tau,
+            "median_ms": statistics.median(timings)}
+
+
+def selection_latency(n: int, comparisons: int = 50) -> List[float]:
+    """
+    Measures the information gain selection on a dataset that has already
+    been annotated for a while. A neighbour window overlap storage keeps the
+    inference step cheap, the selection does not use the overlap.
+
+    Args:
+        n (int): The number of items.
+        comparisons (int): The number of timed comparisons.
+
+    Returns:
+        List[float]: The duration of each selection in milliseconds.
+    """
+    scores = simulation.make_scores(n, seed=n)
+    sort_alg = sa.TrueSkill(
+        list(scores), comparison_max=n * MAX_COMPARISONS_PER_ITEM,
+        overlap_storage=ovl.WindowOverlap.kind, pair_selection="information")
+
+    simulation.annotate(sort_alg, scores, comparisons, seed=n, noise=NOISE)
+
+    timings = []
+    timed(sort_alg, timings)
+    simulation.annotate(sort_alg, scores, comparisons, seed=n, noise=NOISE)
+    return timings
+
+
+def main(sizes: List[int]):
+    """
+    Prints the comparisons needed by both selections for each size, followed
+    by the latency of the information gain selection at LATENCY_SIZE items.
+
+    Args:
+        sizes (List[int]): The dataset sizes to benchmark.
+    """
+    print("target tau: {}".format(TARGET_TAU))
+    print("{:>8} {:>12} {:>12} {:>8} {:>12}".format(
+        "items", "selection", "comparisons", "tau", "median ms"))
+    for n in sizes:
+        for pair_selection in SELECTIONS:
+            result = comparisons_to_target(n, pair_selection)
+            comparisons = result["comparisons"]
+            print("{:>8} {:>12} {:>12} {:>8.4f} {:>12.3f}".format(
+                n, pair_selection,
+                "-" if comparisons is None else comparisons,
+                result["tau"], result["median_ms"]))
+
+    timings = selection_latency(LATENCY_SIZE)
+    print("information selection at {} items: median {:.3f} ms, "
+          "max {:.3f} ms".format(
+              LATENCY_SIZE, statistics.median(timings), max(timings)))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
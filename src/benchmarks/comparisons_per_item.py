@@ -0,0 +1,69 @@
+"""
+Compares how many human comparisons the sorting algorithms need per item, and
+the quality of the resulting ranking, using a simulated annotator.
+
+Run from the src directory, optionally followed by the dataset sizes:
+
+    python -m benchmarks.comparisons_per_item 50 100 200
+"""
+import functools
+import sys
+from typing import Callable, Dict, List
+
+import sorting_algorithms as sa
+from benchmarks import simulation
+
+DEFAULT_SIZES = [50, 100, 200]
+
+ALGORITHMS: Dict[str, Callable[[List[str]], sa.SortingAlgorithm]] = {
+    "MergeSort": sa.MergeSort,
+    "MergeSort4": functools.partial(sa.MergeSort, comparison_size=4),
+    "InsertionSort": sa.InsertionSort,
+    "TrueSkill": sa.TrueSkill,
+}
+
+
+def evaluate(n: int, name: str) -> Dict[str, float]:
+    """
+    Annotates a simulated dataset until the algorithm is finished.
+
+    Args:
+        n (int): The number of items.
+        name (str): The name of the algorithm, a key of ALGORITHMS.
+
+    Returns:
+        Dict[str, float]: The number of comparisons per item, the maximum
+                          reported by the algorithm per item and the Kendall
+                          tau of the result.
+    """
+    scores = simulation.make_scores(n, seed=n)
+    sort_alg = ALGORITHMS[name](list(scores))
+
+    count = simulation.annotate(
+        sort_alg, scores, sort_alg.get_comparison_max() * 2, seed=n)
+
+    return {
+        "per_item": count / n,
+        "max_per_item": sort_alg.get_comparison_max() / n,
+        "tau": simulation.kendall_tau(sort_alg.get_result(), scores)}
+
+
+def main(sizes: List[int]):
+    """
+    Prints the comparisons per item and Kendall tau of every algorithm.
+
+    Args:
+        sizes (List[int]): The dataset sizes to benchmark.
+    """
+    print("{:>8} {:>14} {:>10} {:>10} {:>8}".format(
+        "items", "algorithm", "per item", "max", "tau"))
+    for n in sizes:
+        for name in ALGORITHMS:
+            result = evaluate(n, name)
+            print("{:>8} {:>14} {:>10.2f} {:>10.2f} {:>8.4f}".format(
+                n, name, result["per_item"], result["max_per_item"],
+                result["tau"]))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
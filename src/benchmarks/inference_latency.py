@@ -0,0 +1,70 @@
+"""
+Micro-benchmark of the latency of TrueSkill.inference for growing datasets.
+
+Run from the src directory, optionally followed by the dataset sizes:
+
+    python -m benchmarks.inference_latency 1000 5000 20000
+"""
+import random
+import statistics
+import sys
+import time
+from typing import List
+
+import sorting_algorithms as sa
+
+DEFAULT_SIZES = [1000, 2000, 5000, 10000, 20000]
+
+
+def time_inference(
+        n: int, comparison_size: int = 2, repeats: int = 50) -> List[float]:
+    """
+    Measures the time spent in TrueSkill.inference for random comparisons.
+
+    Args:
+        n (int): The number of items in the dataset.
+        comparison_size (int): The number of items in each comparison.
+        repeats (int): The number of timed inferences.
+
+    Returns:
+        List[float]: The duration of each inference in milliseconds.
+    """
+    rnd = random.Random(n)
+    data = [str(i) + ".jpg" for i in range(n)]
+    sort_alg = sa.TrueSkill(data, comparison_size=comparison_size)
+
+    diff_lvls = [sa.DiffLevel.normal] * (comparison_size - 1)
+
+    # the first inference of a user allocates its bookkeeping, keep it untimed
+    sort_alg.inference(
+        "benchmark", rnd.sample(data, comparison_size), diff_lvls)
+
+    timings = []
+    for _ in range(repeats):
+        keys = rnd.sample(data, comparison_size)
+        start = time.perf_counter()
+        sort_alg.inference("benchmark", keys, diff_lvls)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return timings
+
+
+def main(sizes: List[int]):
+    """
+    Prints the median and 95th percentile inference latency for each size.
+
+    Args:
+        sizes (List[int]): The dataset sizes to benchmark.
+    """
+    print("{:>8} {:>6} {:>12} {:>12}".format("items", "size", "median ms",
+                                             "p95 ms"))
+    for n in sizes:
+        for comparison_size in (2, 4):
+            timings = sorted(time_inference(n, comparison_size))
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            print("{:>8} {:>6} {:>12.3f} {:>12.3f}".format(
+                n, comparison_size, statistics.median(timings), p95))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,82 @@
+"""
+Compares the ranking quality and selection latency of the neighbour window
+TrueSkill mode against the full overlap matrix, using a simulated annotator.
+
+Run from the src directory, optionally followed by the dataset sizes:
+
+    python -m benchmarks.neighbour_window 500 1000 2000
+"""
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+import sorting_algorithms as sa
+from benchmarks import simulation
+
+DEFAULT_SIZES = [250, 500, 1000]
+
+# Comparisons made by the simulated annotator per item.
+COMPARISONS_PER_ITEM = 4
+
+# Noise of the simulated annotator on each score.
+NOISE = 0.02
+
+
+def evaluate(n: int, overlap_storage: str) -> Dict[str, float]:
+    """
+    Annotates a simulated dataset and measures the resulting ranking.
+
+    Args:
+        n (int): The number of items.
+        overlap_storage (str): The overlap storage of the TrueSkill object.
+
+    Returns:
+        Dict[str, float]: The Kendall tau of the result, the median time of
+                          get_comparison in milliseconds and the number of
+                          comparisons performed.
+    """
+    scores = simulation.make_scores(n, seed=n)
+    sort_alg = sa.TrueSkill(
+        list(scores), comparison_max=n * COMPARISONS_PER_ITEM,
+        overlap_storage=overlap_storage)
+
+    timings = []
+    get_comparison = sort_alg.get_comparison
+
+    def timed_get_comparison(user_id: str) -> List[str]:
+        start = time.perf_counter()
+        keys = get_comparison(user_id)
+        timings.append((time.perf_counter() - start) * 1000)
+        return keys
+
+    sort_alg.get_comparison = timed_get_comparison
+
+    count = simulation.annotate(
+        sort_alg, scores, n * COMPARISONS_PER_ITEM, seed=n, noise=NOISE)
+
+    return {
+        "tau": simulation.kendall_tau(sort_alg.get_result(), scores),
+        "median_ms": statistics.median(timings),
+        "comparisons": count}
+
+
+def main(sizes: List[int]):
+    """
+    Prints the Kendall tau and selection latency of both modes for each size.
+
+    Args:
+        sizes (List[int]): The dataset sizes to benchmark.
+    """
+    print("{:>8} {:>8} {:>12} {:>8} {:>12}".format(
+        "items", "storage", "comparisons", "tau", "median ms"))
+    for n in sizes:
+        for overlap_storage in ("dense", "window"):
+            result = evaluate(n, overlap_storage)
+            print("{:>8} {:>8} {:>12} {:>8.4f} {:>12.3f}".format(
+                n, overlap_storage, result["comparisons"], result["tau"],
+                result["median_ms"]))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,121 @@
+"""
+Helpers shared by the benchmarks that simulate an annotator with known scores.
+"""
+import random
+from typing import Dict, List, Union
+
+import numpy as np
+
+import sorting_algorithms as sa
+
+# Score gaps below this value are reported as equal by the annotator.
+DRAW_GAP = 0.005
+
+# Score gaps above this value are reported as major differences.
+MAJOR_GAP = 0.2
+
+
+def make_scores(n: int, seed: int = 0) -> Dict[str, float]:
+    """
+    Creates a dataset of items with uniformly distributed true scores.
+
+    Args:
+        n (int): The number of items.
+        seed (int): The seed of the scores.
+
+    Returns:
+        Dict[str, float]: The true score of each item.
+    """
+    rnd = random.Random(seed)
+    return {str(i) + ".jpg": rnd.random() for i in range(n)}
+
+
+def answer(
+        keys: List[Union[int, float, str]], scores: Dict[str, float],
+        rnd: random.Random, noise: float = 0.0):
+    """
+    Orders a comparison the way an annotator with the given scores would.
+
+    Args:
+        keys (List): The keys of the compared items.
+        scores (Dict[str, float]): The true score of each item.
+        rnd (Random): The source of the annotator noise.
+        noise (float): The standard deviation of the noise on each score.
+
+    Returns:
+        A tuple of the keys ordered from lowest to highest perceived score and
+        the difference levels between consecutive keys.
+    """
+    perceived = {k: scores[k] + rnd.gauss(0, noise) for k in keys}
+    keys = sorted(keys, key=perceived.get)
+
+    diff_lvls = []
+    for low, high in zip(keys, keys[1:]):
+        gap = perceived[high] - perceived[low]
+        if gap < DRAW_GAP:
+            diff_lvls.append(sa.DiffLevel.none)
+        elif gap > MAJOR_GAP:
+            diff_lvls.append(sa.DiffLevel.major)
+        else:
+            diff_lvls.append(sa.DiffLevel.normal)
+
+    return keys, diff_lvls
+
+
+def annotate(
+        sort_alg: sa.SortingAlgorithm, scores: Dict[str, float],
+        comparisons: int, seed: int = 0, noise: float = 0.0,
+        user_id: str = "simulation") -> int:
+    """
+    Lets a simulated annotator perform comparisons until the budget is spent
+    or the algorithm is finished.
+
+    Args:
+        sort_alg (SortingAlgorithm): The algorithm to annotate.
+        scores (Dict[str, float]): The true score of each item.
+        comparisons (int): The maximum number of comparisons.
+        seed (int): The seed of the annotator noise.
+        noise (float): The standard deviation of the noise on each score.
+        user_id (str): The ID of the simulated user.
+
+    Returns:
+        int: The number of comparisons performed.
+    """
+    rnd = random.Random(seed)
+
+    for count in range(comparisons):
+        if sort_alg.is_finished():
+            return count
+
+        keys = sort_alg.get_comparison(user_id)
+        if not keys:
+            return count
+
+        sort_alg.inference(user_id, *answer(keys, scores, rnd, noise))
+
+    return comparisons
+
+
+def kendall_tau(
+        ranking: List[Union[int, float, str]],
+        scores: Dict[str, float]) -> float:
+    """
+    Computes the Kendall rank correlation between a ranking and the true
+    scores.
+
+    Args:
+        ranking (List): The keys ordered from lowest to highest.
+        scores (Dict[str, float]): The true score of each item.
+
+    Returns:
+        float: The Kendall tau, 1 when the ranking matches the scores.
+    """
+    true = np.array([scores[k] for k in ranking])
+    n = len(true)
+
+    concordance = 0
+    for i in range(n - 1):
+        # positions increase along the ranking, so only the scores can differ
+        concordance += np.sign(true[i + 1:] - true[i]).sum()
+
+    return float(concordance / (n * (n - 1) / 2))
@@ -120,7 +120,7 @@ class AnnotationGui():
 
             sort_alg = save_obj["sort_alg"]
             if type(sort_alg) == HybridTrueSkill:
-                sort_alg = sort_alg.sort_alg
+                sort_alg = sort_alg.get_phase_algorithm()
 
             if type(sort_alg) == RatingAlgorithm:
                 ordering_screen = RatingScreen(
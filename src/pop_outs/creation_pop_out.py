@@ -95,7 +95,8 @@ class CreationPopOut():
 
         self.algorithm_selection = ctk.CTkOptionMenu(
             master=pop_out,
-            values=["True Skill", "Merge Sort", "Rating", "Hybrid"],
+            values=["True Skill", "Merge Sort", "Insertion Sort", "Rating",
+                    "Hybrid"],
             width=200, height=40, font=('Helvetica bold', 20),
             command=lambda value, pop_out=pop_out, slider=self.slider,
             slider_frame=slider_frame, label=self.comparison_size_label,
@@ -273,7 +274,7 @@ class CreationPopOut():
             comp_label (CTkLabel): The label for comparison size.
         """
 
-        if value == "Merge Sort":
+        if value == "Insertion Sort":
             self.change_slider_row_state(
                 True, pop_out, slider_frame, comp_label)
             slider.set(2)
@@ -64,8 +64,9 @@ class DeletePopOut():
 
     def delete_save(self):
         """
-        Deletes the .csv and .pickle files associated with the save object.
-        Refreshes menu and destroys pop out.
+        Deletes the .csv and .pickle files associated with the save object,
+        as well as its overlap file if it has one. Refreshes menu and destroys
+        pop out.
         """
 
         path = saves_handler.get_path_to_save(self.save_obj)
@@ -74,4 +75,7 @@ class DeletePopOut():
         os.remove(path + ".csv")
         os.remove(path + ".pickle")
 
+        if os.path.exists(path + saves_handler.OVERLAP_SUFFIX):
+            os.remove(path + saves_handler.OVERLAP_SUFFIX)
+
         self.deletion_callback()
@@ -0,0 +1,94 @@
+import json
+from typing import Callable
+
+import customtkinter as ctk
+
+from utils import ctk_utils
+
+
+class TransitionFailedPopOut():
+    """
+    Class representing a pop-out window shown when the ranking phase of a
+    hybrid annotation could not be prepared. The annotation stays in the
+    rating phase, so the preparation can be retried.
+    """
+
+    def __init__(
+            self, root: ctk.CTk, error: str, retry: Callable,
+            back_to_menu: Callable):
+        """
+        Initialize the TransitionFailedPopOut.
+
+        Args:
+            root (CTk): The root window.
+            error (str): A description of the error.
+            retry (function): A function preparing the ranking phase again.
+            back_to_menu (function): A function to go back to the main menu.
+        """
+
+        self.root = root
+        self.retry = retry
+        self.back_to_menu = back_to_menu
+
+        self.pop_out = ctk.CTkToplevel()
+
+        w = 700
+        h = 300
+        x, y = ctk_utils.center(self.root, w, h)
+
+        self.pop_out.geometry('%dx%d+%d+%d' % (w, h, x, y))
+        self.pop_out.columnconfigure(index=0, weight=1)
+        self.pop_out.columnconfigure(index=1, weight=1)
+        self.pop_out.rowconfigure(index=0, weight=1)
+        self.pop_out.rowconfigure(index=1, weight=1)
+
+        with open('_internal/prompts.json', 'r') as file:
+            prompts = json.load(file)
+
+        label = ctk.CTkLabel(
+            text=prompts['ranking_failed'] + "\n" + error,
+            master=self.pop_out, font=('Helvetica bold', 20),
+            wraplength=w - 40)
+
+        label.grid(row=0, column=0, sticky='nsew', columnspan=2)
+
+        retry_button = ctk.CTkButton(
+            text="Retry", command=self.on_retry, width=w // 2 - 20,
+            height=h // 5, master=self.pop_out, font=('Helvetica bold', 30))
+        retry_button.grid(row=1, column=0, sticky='sew',
+                          pady=(0, 10), padx=(10, 5))
+        menu_button = ctk.CTkButton(
+            text="Return to menu", command=self.on_back_to_menu,
+            width=w // 2 - 20, height=h // 5, master=self.pop_out,
+            font=('Helvetica bold', 30))
+        menu_button.grid(row=1, column=1, sticky='sew',
+                         pady=(0, 10), padx=(5, 10))
+
+        self.pop_out.protocol("WM_DELETE_WINDOW", self.on_back_to_menu)
+
+        self.pop_out.grab_set()
+        self.pop_out.attributes("-topmost", True)
+
+    def close(self):
+        """
+        Closes the pop-out.
+        """
+
+        self.pop_out.grab_release()
+        self.pop_out.destroy()
+
+    def on_retry(self):
+        """
+        Closes the pop-out and prepares the ranking phase again.
+        """
+
+        self.close()
+        self.retry()
+
+    def on_back_to_menu(self):
+        """
+        Closes the pop-out and returns to the main menu.
+        """
+
+        self.close()
+        self.back_to_menu()
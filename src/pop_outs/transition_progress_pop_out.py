@@ -0,0 +1,62 @@
+import json
+
+import customtkinter as ctk
+
+from utils import ctk_utils
+
+
+class TransitionProgressPopOut():
+    """
+    Class representing a pop-out window shown while the ranking phase of a
+    hybrid annotation is being prepared
+    """
+
+    def __init__(self, root: ctk.CTk):
+        """
+        Initialize the TransitionProgressPopOut.
+
+        Args:
+            root (CTk): The root window.
+        """
+
+        self.root = root
+
+        self.pop_out = ctk.CTkToplevel()
+
+        w = 700
+        h = 300
+        x, y = ctk_utils.center(self.root, w, h)
+
+        self.pop_out.geometry('%dx%d+%d+%d' % (w, h, x, y))
+        self.pop_out.columnconfigure(index=0, weight=1)
+        self.pop_out.rowconfigure(index=0, weight=1)
+        self.pop_out.rowconfigure(index=1, weight=1)
+
+        with open('_internal/prompts.json', 'r') as file:
+            prompts = json.load(file)
+
+        label = ctk.CTkLabel(
+            text=prompts['preparing_ranking'],
+            master=self.pop_out, font=('Helvetica bold', 26))
+
+        label.grid(row=0, column=0, sticky='nsew')
+
+        self.progress_bar = ctk.CTkProgressBar(
+            master=self.pop_out, width=w - 100, mode="indeterminate")
+        self.progress_bar.grid(row=1, column=0, pady=(0, 40))
+        self.progress_bar.start()
+
+        # the pop-out is closed once the ranking phase is ready
+        self.pop_out.protocol("WM_DELETE_WINDOW", lambda: None)
+
+        self.pop_out.grab_set()
+        self.pop_out.attributes("-topmost", True)
+
+    def close(self):
+        """
+        Closes the pop-out.
+        """
+
+        self.progress_bar.stop()
+        self.pop_out.grab_release()
+        self.pop_out.destroy()
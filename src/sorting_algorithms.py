@@ -1,12 +1,25 @@
 import copy
+import functools
+import itertools
 import random
 from abc import ABC, abstractmethod
+from collections import deque
 from enum import IntEnum
-from typing import Any, Dict, List, Optional, Union
-from tqdm import tqdm
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import numpy as np
-from trueskill import Rating, rate_1vs1
+import trueskill
+from trueskill import Rating
+
+import utils.overlap as ovl
+import utils.rating_update as rating_update
+from utils.compared_pairs import ComparedPairs
+from utils.count_queue import CountQueue
+from utils.pair_index import BandedPairIndex, BestPairIndex
+from utils.ranking_index import RankingIndex
+from utils.rating_matrix import RatingMatrix
+from utils.rating_queue import UNRATED, RatingQueue, user_seed
+from utils.rating_store import RatingStore, rating_arrays
 
 
 class DiffLevel(IntEnum):
@@ -104,22 +117,371 @@ class SortingAlgorithm (ABC):
         pass
 
 
+class Merge:
+    """
+    A merge of sorted runs, carried out independently of the other merges of
+    its layer. Every comparison shows up to size values taken from the fronts
+    of the runs, and all values that are known to precede the unseen rest of
+    the runs are moved to the output at once.
+    """
+
+    def __init__(
+            self, runs: List[Iterable[Union[int, float, str]]],
+            output: Optional[List[Union[int, float, str]]] = None,
+            size: int = 2):
+        """
+        Initialize the Merge.
+
+        Args:
+            runs: The sorted runs.
+            output: The values already merged.
+            size: The number of values shown per comparison.
+        """
+        self.runs = [deque(run) for run in runs]
+        self.output = list(output or [])
+        self.size = size
+
+        if self.is_finished():
+            self.flush()
+
+    def __setstate__(self, state: dict):
+        """
+        Restores a pickled Merge object, converting the two runs of older
+        saves into a list of runs.
+
+        Args:
+            state: The pickled attributes of the object.
+        """
+        if "left" in state:
+            state["runs"] = [state.pop("left"), state.pop("right")]
+            state["size"] = 2
+        self.__dict__.update(state)
+
+    def window(self) -> List[Tuple[deque, int]]:
+        """
+        Get the number of values shown from the front of each run. Every
+        unfinished run shows its head, the remaining places are handed out in
+        turns to the runs with values left.
+
+        Returns:
+            A list of the unfinished runs paired with their shown count.
+        """
+        runs = [run for run in self.runs if run]
+        counts = [1] * len(runs)
+        free = self.size - len(runs)
+
+        while free > 0:
+            grown = False
+            for i, run in enumerate(runs):
+                if free > 0 and counts[i] < len(run):
+                    counts[i] += 1
+                    free -= 1
+                    grown = True
+            if not grown:
+                break
+
+        return list(zip(runs, counts))
+
+    def heads(self) -> List[Union[int, float, str]]:
+        """
+        Get the values shown for the next comparison.
+
+        Returns:
+            A list containing the shown front values of each run, in the order
+            of the runs.
+        """
+        return [value for run, count in self.window()
+                for value in itertools.islice(run, count)]
+
+    def is_finished(self) -> bool:
+        """
+        Check if at most one of the runs is left.
+
+        Returns:
+            True if the merge is finished, False otherwise.
+        """
+        return sum(1 for run in self.runs if run) < 2
+
+    def advance(
+            self, ordering: List[Union[int, float, str]], draws: List[bool]):
+        """
+        Moves the shown values that precede everything not shown to the
+        output. The ordering is cut at the last shown value of the first run
+        with unseen values, as these are at least as large, and extended over
+        the values equal to it. Where the ordering contradicts the order
+        within a run, e.g. among equal values, the run keeps its own order.
+
+        Args:
+            ordering: The shown values, ordered from smallest to largest.
+            draws: Whether each value was considered equal to the next one.
+        """
+        window = self.window()
+        position = {value: i for i, value in enumerate(ordering)}
+
+        cut = len(ordering) - 1
+        owner = {}
+        for run, count in window:
+            for value in itertools.islice(run, count):
+                owner[value] = run
+            if count < len(run):
+                cut = min(cut, position[run[count - 1]])
+
+        while cut < len(ordering) - 1 and draws[cut]:
+            cut += 1
+
+        # every place up to the cut is taken by the head of the run of its
+        # value, so the values of a run leave in the order of the run
+        moved = len(self.output)
+        for value in ordering[:cut + 1]:
+            self.output.append(owner[value].popleft())
+
+        # a submission always moves at least the smallest shown value
+        if len(self.output) == moved:
+            self.output.append(owner[ordering[0]].popleft())
+
+        if self.is_finished():
+            self.flush()
+
+    def flush(self):
+        """
+        Appends the remainder of the runs to the output.
+        """
+        for run in self.runs:
+            self.output.extend(run)
+            run.clear()
+
+
 class MergeSort(SortingAlgorithm):
-    """Implementation of the Merge Sort algorithm"""
+    """
+    Implementation of the Merge Sort algorithm. Every merge combines up to
+    comparison_size runs, and all merges of a layer are independent, so
+    different users are given different merges to work on.
+    """
 
-    def __init__(self, data: List[Union[int, float, str]]):
+    def __init__(
+            self, data: List[Union[int, float, str]],
+            comparison_size: int = 2):
         """
         Initialize the MergeSort object.
 
+        Args:
+            data: The list of values to be sorted.
+            comparison_size: The number of values ordered per comparison,
+                             which is also the number of runs per merge.
+        """
+
+        self.data = data
+        self.comparison_size = comparison_size
+        self.comp_count = 0
+        self.start_layer([[value] for value in data])
+
+    def __setstate__(self, state: dict):
+        """
+        Restores a pickled MergeSort object, converting the list based layers
+        of older saves into merges.
+
+        Args:
+            state: The pickled attributes of the object.
+        """
+        if "current_layer" not in state:
+            self.__dict__.update(state)
+            return
+
+        current_layer = state.pop("current_layer")
+        next_sorted = state.pop("next_sorted")
+        self.__dict__.update(state)
+
+        if len(current_layer) < 2:
+            self.start_layer(current_layer)
+            return
+
+        # the merges before the last entry of next_sorted are completed and
+        # the last entry holds the output of the merge of the first two runs
+        rest = current_layer[2:]
+        self.start_layer(rest)
+        self.merges = [Merge([], run) for run in next_sorted[:-1]] + [
+            Merge(current_layer[:2], next_sorted[-1])] + self.merges
+
+    def start_layer(self, runs: List[List[Union[int, float, str]]]):
+        """
+        Groups the runs into the merges of a new layer. A single run left over
+        at the end is carried over to the next layer.
+
+        Args:
+            runs: The sorted runs of the layer.
+        """
+        k = self.comparison_size
+        self.merges = [Merge(runs[i:i + k], size=k)
+                       for i in range(0, len(runs) - 1, k)]
+        self.carry = list(runs[-1]) if len(runs) % k == 1 else None
+        self.assignments = {}
+
+    def get_merge(self, user_id: str) -> Merge:
+        """
+        Get the merge a user is working on. Users without an unfinished merge
+        are assigned the unfinished merge with the fewest users.
+
+        Args:
+            user_id: The ID of the user.
+
+        Returns:
+            The merge of the user.
+        """
+        i = self.assignments.get(user_id)
+        if i is None or self.merges[i].is_finished():
+            users = {}
+            for other_id, j in self.assignments.items():
+                if other_id != user_id:
+                    users[j] = users.get(j, 0) + 1
+
+            i = min((j for j, merge in enumerate(self.merges)
+                     if not merge.is_finished()),
+                    key=lambda j: (users.get(j, 0), j))
+            self.assignments[user_id] = i
+
+        return self.merges[i]
+
+    def get_comparison(self, user_id: str) -> List[Union[int, float, str]]:
+        """
+        Get the next comparison.
+
+        Args:
+            user_id: The ID of the user making the comparison.
+
+        Returns:
+            A list of up to comparison_size values taken from the fronts of
+            the runs of the user's merge.
+        """
+        return self.get_merge(user_id).heads()
+
+    def inference(
+            self, user_id: str, keys: List[Union[int, float, str]],
+            diff_lvls: List[object]):
+        """
+        Perform the inference step based on the user's choices. A comparison
+        that is no longer at the head of its merge, because another user
+        sharing the merge answered it first, is ignored.
+
+        Args:
+            user_id: The ID of the user.
+            keys: The keys of the items compared by the user.
+            diff_lvls: The difference levels asessed by the user.
+        """
+        merge = None
+        for candidate in [self.get_merge(user_id)] + self.merges:
+            if (not candidate.is_finished() and
+                    set(candidate.heads()) == set(keys)):
+                merge = candidate
+                break
+
+        if merge is None:
+            return
+
+        merge.advance(keys, [diff_lvl.value == 0 for diff_lvl in diff_lvls])
+
+        if all(other.is_finished() for other in self.merges):
+            runs = [other.output for other in self.merges]
+            if self.carry is not None:
+                runs.append(self.carry)
+            self.start_layer(runs)
+
+        self.comp_count += 1
+
+    def get_result(self) -> Optional[List[Union[int, float, str]]]:
+        """
+        Get the sorted result if the sorting process is finished.
+
+        Returns:
+            The sorted result as a list of values, or 
+            None if the sorting is not finished.
+        """
+
+        if self.is_finished():
+            # the only run left is carried over as the result
+            return self.carry
+
+    def is_finished(self) -> bool:
+        """
+        Check if the sorting process is finished.
+
+        Returns:
+            True if the sorting process is finished, False otherwise.
+        """
+        return not self.merges
+
+    def comparison_is_available(self, user_id: str) -> bool:
+        """
+        Check if there are more comparisons available for the user.
+
+        Args:
+            user_id: The ID of the user.
+
+        Returns:
+            True if there are more comparisons available, False otherwise.
+        """
+        return not self.is_finished()
+
+    def get_comparison_count(self) -> int:
+        """
+        Get the number of comparisons made so far.
+
+        Returns:
+            The number of comparisons made.
+        """
+        return self.comp_count
+
+    def get_comparison_max(self) -> int:
+        """
+        Get the maximum number of comparisons needed for the sorting process.
+
+        Returns:
+            The maximum number of comparisons needed.
+        """
+        n = len(self.data)
+        if self.comparison_size == 2:
+            # the estimate of pairwise saves is kept, so their progress does
+            # not change
+            return max(1, int(n * np.log(max(n, 1))))
+
+        # log_k(n) layers of merges, each placing every value about once
+        layers = np.log(max(n, 1)) / np.log(self.comparison_size)
+        return max(1, int(np.ceil(n * layers)))
+
+
+class InsertionSort(SortingAlgorithm):
+    """
+    Implementation of binary insertion sort. Every value is inserted into the
+    sorted groups of equal values with a binary search, which needs close to
+    the minimum number of comparisons. Values assessed as equal share a group.
+    """
+
+    def __init__(self, data: List[Union[int, float, str]]):
+        """
+        Initialize the InsertionSort object.
+
         Args:
             data: The list of values to be sorted.
         """
 
         self.data = data
         self.comparison_size = 2
-        self.current_layer = [[value] for value in data]
-        self.next_sorted = [[]]
         self.comp_count = 0
+        # inserting into i groups takes at most ceil(log2(i + 1)) comparisons
+        self.comparison_max = sum(i.bit_length() for i in range(len(data)))
+
+        self.groups = [[data[0]]] if data else []
+        self.next_index = 1
+        self.low = 0
+        self.high = len(self.groups)
+
+    def pivot(self) -> Union[int, float, str]:
+        """
+        Get the value that the inserted value is compared with next.
+
+        Returns:
+            The first value of the middle group of the search range.
+        """
+        return self.groups[(self.low + self.high) // 2][0]
 
     def get_comparison(self, user_id: str) -> List[Union[int, float, str]]:
         """
@@ -129,72 +491,62 @@ class MergeSort(SortingAlgorithm):
             user_id: The ID of the user making the comparison.
 
         Returns:
-            A list of two elements representing the next comparison pair.
+            A list containing the value being inserted and the pivot.
         """
-        return [self.current_layer[0][0], self.current_layer[1][0]]
+        return [self.data[self.next_index], self.pivot()]
 
     def inference(
             self, user_id: str, keys: List[Union[int, float, str]],
             diff_lvls: List[object]):
         """
-        Perform the inference step based on the user's choices.
+        Perform the inference step based on the user's choices. A comparison
+        that is no longer the current one, because another user answered it
+        first, is ignored.
 
         Args:
             user_id: The ID of the user.
             keys: The keys of the items compared by the user.
             diff_lvls: The difference levels asessed by the user.
         """
-        if self.current_layer[0][0] == keys[0]:
-            smallest_i = 0
-        else:
-            smallest_i = 1
+        value = self.data[self.next_index]
+        middle = (self.low + self.high) // 2
 
-        smallest = self.current_layer[smallest_i].pop(0)
+        if set(keys) != {value, self.pivot()}:
+            return
 
         if diff_lvls[0].value == 0:
-            equally_smallest = self.current_layer[1 - smallest_i].pop(0)
-
-        if not self.current_layer[0] or not self.current_layer[1]:
-            if diff_lvls[0].value == 0:
-                layer = [smallest] + [equally_smallest] + \
-                    self.current_layer.pop(0) + self.current_layer.pop(0)
+            self.groups[middle].append(value)
+            self.next_value()
+        else:
+            if keys[0] == value:
+                self.high = middle
             else:
-                layer = [smallest] + \
-                    self.current_layer.pop(0) + self.current_layer.pop(0)
-            self.next_sorted[-1] += layer
+                self.low = middle + 1
 
-            if len(self.current_layer) > 1:
-                self.next_sorted.append([])
-            else:
-                if len(self.current_layer) == 1:
-                    # add the remaining sublist to the next sorted layer
-                    self.next_sorted += [self.current_layer.pop(0)]
-                # update the current layer to the next sorted layer
-                self.current_layer = self.next_sorted
-                self.next_sorted = [[]]  # reset the next sorted layer
-
-        else:
-            # if neither of the two sublists in the current layer are empty,
-            # add the smallest element to the current nested
-            # list of the next sorted layer
-            self.next_sorted[-1].append(smallest)
-            if diff_lvls[0].value == 0:
-                self.next_sorted[-1].append(equally_smallest)
+            if self.low == self.high:
+                self.groups.insert(self.low, [value])
+                self.next_value()
 
         self.comp_count += 1
 
+    def next_value(self):
+        """
+        Starts the binary search of the next value over all groups.
+        """
+        self.next_index += 1
+        self.low = 0
+        self.high = len(self.groups)
+
     def get_result(self) -> Optional[List[Union[int, float, str]]]:
         """
         Get the sorted result if the sorting process is finished.
 
         Returns:
-            The sorted result as a list of values, or 
+            The sorted result as a list of values, or
             None if the sorting is not finished.
         """
-
         if self.is_finished():
-            # return the first and only sublist of the current layer if the
-            return self.current_layer[0]
+            return [value for group in self.groups for value in group]
 
     def is_finished(self) -> bool:
         """
@@ -203,7 +555,7 @@ class MergeSort(SortingAlgorithm):
         Returns:
             True if the sorting process is finished, False otherwise.
         """
-        return len(self.current_layer[0]) == len(self.data)
+        return self.next_index >= len(self.data)
 
     def comparison_is_available(self, user_id: str) -> bool:
         """
@@ -233,19 +585,35 @@ class MergeSort(SortingAlgorithm):
         Returns:
             The maximum number of comparisons needed.
         """
-        n = len(self.data)
-        return int(n * np.log(n))
+        return self.comparison_max
 
 
 class TrueSkill (SortingAlgorithm):
     """Implementation of the TrueSkill algorithm"""
 
+    # attributes derived from the ratings and comparisons, which are rebuilt
+    # on demand. Leaving them out of the pickled state keeps them from
+    # dominating the size of every save and undo copy.
+    DERIVED_STATE = ("pair_indices", "overlap_index", "ranking", "_key_index")
+
+    # the number of following neighbours in mu paired with each item by the
+    # information pair selection, more distant pairs gain little for the
+    # ranking and only slow the selection down
+    INFORMATION_WINDOW = 4
+
     def __init__(
             self, data: List[Union[int, float, str]],
             comparison_size: int = 2, comparison_max: Optional[int] = None,
             initial_mus: Optional[Dict[Union[int, float, str],
                                        float]] = None,
-            random_comparisons: bool = False, same_comp_amount=False, initial_std=None):
+            random_comparisons: bool = False, same_comp_amount=False, initial_std=None,
+            compact_ratings: bool = True, overlap_storage: str = "dense",
+            overlap_path: Optional[str] = None,
+            neighbour_window: int = ovl.DEFAULT_WINDOW,
+            update_mode: str = "pairwise",
+            overlap_buckets: Optional[Dict[Union[int, float, str],
+                                           Any]] = None,
+            pair_selection: str = "overlap"):
         """
         Initialize the TrueSkill object.
 
@@ -258,6 +626,31 @@ class TrueSkill (SortingAlgorithm):
                          for each value.
             random_comparisons: A flag indicating whether to perform random 
                                 comparisons.
+            initial_std: The initial standard deviation of every value, or a
+                         dictionary of them per value. Only used together
+                         with initial_mus.
+            compact_ratings: A flag indicating whether the ratings should be
+                             stored in a RatingStore rather than a dictionary.
+            overlap_storage: The kind of storage used for the overlap matrix,
+                             "dense", "packed" (float32 upper triangle),
+                             "memmap" (packed, in a file), "window" (only
+                             the closest neighbours in mu) or "bucketed"
+                             (only items of the same or adjacent buckets).
+            overlap_path: The file backing a "memmap" overlap storage, a
+                          temporary file is used if None.
+            neighbour_window: The number of neighbours in mu scored for each
+                              item by a "window" overlap storage.
+            update_mode: How an ordering of more than two items updates the
+                         ratings, "pairwise" (a match for every pair) or
+                         "ranked" (a single ranked match).
+            overlap_buckets: A dictionary of the bucket of each value for a
+                             "bucketed" overlap storage, labels on a scale
+                             with a step of one such as the ratings of the
+                             values.
+            pair_selection: How a comparison of a user is chosen, "overlap"
+                            (the largest interval overlap) or "information"
+                            (the largest expected information gain among
+                            neighbours in mu).
         """
         self.n = len(data)
         self.data = list(data)
@@ -270,39 +663,121 @@ class TrueSkill (SortingAlgorithm):
             self.comparison_max = comparison_max
 
         if initial_mus:
-            if initial_std is not None:
-                self.ratings = {
-                    k: Rating(initial_mus[k], initial_std) for k in data}
+            if isinstance(initial_std, dict):
+                initial_ratings = [
+                    Rating(initial_mus[k], initial_std[k]) for k in self.data]
+            elif initial_std is not None:
+                initial_ratings = [
+                    Rating(initial_mus[k], initial_std) for k in self.data]
             else:
-                self.ratings = {
-                    k: Rating(initial_mus[k]) for k in data}
-
-            self.overlap_matrix = np.zeros((self.n, self.n))
-            print("constructing overlap matrix")
-            for i in tqdm(range(self.n)):
-                for j in range(i + 1, self.n):
-                    overlap = self.intervals_overlap(self.data[i],
-                                                     self.data[j])
-                    self.overlap_matrix[i, j] = overlap
-                    self.overlap_matrix[j, i] = overlap
+                initial_ratings = [Rating(initial_mus[k]) for k in self.data]
         else:
-            self.ratings = {k: Rating() for k in data}
+            initial_ratings = [Rating() for _ in self.data]
 
-            self.overlap_matrix = np.full(
-                (self.n, self.n),
+        if compact_ratings:
+            self.ratings = RatingStore(
+                self.data, [r.mu for r in initial_ratings],
+                [r.sigma for r in initial_ratings])
+        else:
+            self.ratings = dict(zip(self.data, initial_ratings))
+
+        if overlap_buckets is not None:
+            overlap_buckets = np.array([overlap_buckets[k] for k in self.data])
+
+        self.overlap = ovl.create_storage(
+            overlap_storage, self.n, overlap_path,
+            max(neighbour_window, comparison_size - 1), overlap_buckets)
+
+        if initial_mus:
+            self.overlap.build(*self.rating_arrays())
+        else:
+            self.overlap.fill(
                 self.intervals_overlap(self.data[0],
                                        self.data[1]))
 
-        np.fill_diagonal(self.overlap_matrix, -np.inf)
-
         if self.same_comp_amount:
-            self.comp_tracker = np.zeros((self.n))
+            self.comp_tracker = CountQueue(np.zeros(self.n))
 
         self.comparison_size = comparison_size
         self.comp_count = 0
+        self.update_mode = update_mode
+        self.pair_selection = pair_selection
 
         self.user_comparisons = {}
 
+    def __setstate__(self, state: dict):
+        """
+        Restores a pickled TrueSkill object, converting the dense overlap
+        matrix, comparison masks and comparison counts of older saves into
+        their current storage.
+
+        Args:
+            state: The pickled attributes of the object.
+        """
+        self.__dict__.update(state)
+
+        if "overlap_matrix" in state:
+            self.overlap = ovl.DenseOverlap(
+                self.n, self.__dict__.pop("overlap_matrix"))
+
+        for user_id, compared in self.user_comparisons.items():
+            if isinstance(compared, np.ndarray):
+                self.user_comparisons[user_id] = ComparedPairs.from_mask(
+                    compared)
+
+        if isinstance(getattr(self, 'comp_tracker', None), np.ndarray):
+            self.comp_tracker = CountQueue(self.comp_tracker)
+
+        # older stores hold a copy of the keys, which has to be compared
+        # element by element every time the ratings are read
+        if isinstance(self.ratings, RatingStore) and \
+                self.ratings.keys_list is not self.data and \
+                self.ratings.keys_list == self.data:
+            self.ratings.keys_list = self.data
+
+    def __getstate__(self) -> dict:
+        # an overlap file shared with an undone copy may hold stale rows
+        self.sync_overlap()
+
+        state = self.__dict__.copy()
+        for name in self.DERIVED_STATE:
+            state.pop(name, None)
+        return state
+
+    @property
+    def overlap_matrix(self) -> np.ndarray:
+        """
+        The full overlap matrix, only available with dense overlap storage.
+
+        Returns:
+            The n x n overlap matrix.
+        """
+        return self.overlap.matrix
+
+    @property
+    def key_index(self) -> Dict[Union[int, float, str], int]:
+        """
+        A mapping from each key to its position in data. The mapping is built
+        lazily so that algorithms loaded from older saves receive one as well.
+
+        Returns:
+            The dictionary mapping keys to their index.
+        """
+        key_index = getattr(self, '_key_index', None)
+        if key_index is None or len(key_index) != len(self.data):
+            key_index = {k: i for i, k in enumerate(self.data)}
+            self._key_index = key_index
+        return key_index
+
+    def rating_arrays(self):
+        """
+        Get the means and standard deviations of all items, ordered as data.
+
+        Returns:
+            A tuple of two arrays containing the means and standard deviations.
+        """
+        return rating_arrays(self.ratings, self.data)
+
     def intervals_overlap(
             self, key1: Union[int, float, str],
             key2: Union[int, float, str]) -> float:
@@ -337,13 +812,127 @@ class TrueSkill (SortingAlgorithm):
         Args:
             key: The key to update the overlap matrix.
         """
-        key_i = self.data.index(key)
+        self.update_overlap_rows([key])
+
+    def update_overlap_rows(self, keys: List[Union[int, float, str]]):
+        """
+        Update the rows and columns of the overlap matrix belonging to the
+        given keys, computed as a single broadcast against all items.
+
+        Args:
+            keys: The keys whose overlap values should be updated.
+        """
+        self.refresh_overlap_rows(
+            np.unique([self.key_index[k] for k in keys]))
+
+    def refresh_overlap_rows(self, rows: np.ndarray):
+        """
+        Recompute rows and columns of the overlap matrix from the ratings.
+
+        Args:
+            rows: The sorted indices of the rows to recompute.
+        """
+        self.overlap.update(rows, *self.rating_arrays())
+
+        for pair_index in self.get_pair_indices().values():
+            pair_index.invalidate(rows)
+
+        if self.overlap.kind != ovl.WindowOverlap.kind:
+            self.get_overlap_index().invalidate(rows)
+
+    def sync_overlap(self):
+        """
+        Recompute the rows of the overlap matrix that were overwritten by
+        another copy of the algorithm sharing the same overlap file, e.g.
+        after an annotation has been undone.
+        """
+        stale = self.overlap.stale_rows()
+        if len(stale):
+            self.refresh_overlap_rows(stale)
+
+    def get_pair_indices(self) -> Dict[str, BestPairIndex]:
+        """
+        Get the best pair index of every user. Algorithms loaded from older
+        saves receive an empty dictionary.
 
-        for i in range(self.n):
-            if i != key_i:
-                overlap = self.intervals_overlap(key, self.data[i])
-                self.overlap_matrix[i][key_i] = overlap
-                self.overlap_matrix[key_i][i] = overlap
+        Returns:
+            A dictionary mapping user IDs to their BestPairIndex.
+        """
+        if not hasattr(self, 'pair_indices'):
+            self.pair_indices = {}
+        return self.pair_indices
+
+    def get_overlap_index(self) -> BestPairIndex:
+        """
+        Get the index over the unmasked overlap matrix, which tracks the
+        largest remaining overlap as rows are refreshed. Algorithms loaded
+        from older saves receive a new index.
+
+        Returns:
+            The BestPairIndex of the overlap matrix.
+        """
+        if getattr(self, 'overlap_index', None) is None:
+            self.overlap_index = self.new_pair_index()
+        return self.overlap_index
+
+    def max_overlap(self) -> float:
+        """
+        Get the largest overlap between two items.
+
+        Returns:
+            The largest value of the overlap matrix.
+        """
+        self.sync_overlap()
+
+        if self.overlap.kind == ovl.WindowOverlap.kind:
+            return self.overlap.max()
+        return self.get_overlap_index().best_pair(self.overlap.rows)[2]
+
+    def get_pair_index(self, user_id: str) -> BestPairIndex:
+        """
+        Get the index over the masked overlap matrix of a user, creating it
+        if it does not exist.
+
+        Args:
+            user_id: The ID of the user.
+
+        Returns:
+            The BestPairIndex of the user.
+        """
+        pair_indices = self.get_pair_indices()
+        if user_id not in pair_indices:
+            pair_indices[user_id] = self.new_pair_index()
+        return pair_indices[user_id]
+
+    def new_pair_index(self) -> BestPairIndex:
+        """
+        Creates an empty index over the overlap matrix. The index of a
+        bucketed storage only scans the candidates of every item.
+
+        Returns:
+            The BestPairIndex matching the overlap storage.
+        """
+        if self.overlap.kind == ovl.BucketedOverlap.kind:
+            return BandedPairIndex(*self.overlap.band())
+        return BestPairIndex(self.n)
+
+    def masked_overlap_rows(
+            self, user_id: str, rows: np.ndarray,
+            cols: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Get rows of the overlap matrix where the pairs that the user has
+        already compared are set to zero.
+
+        Args:
+            user_id: The ID of the user.
+            rows: The indices of the rows.
+            cols: The indices of the columns, all columns if None.
+
+        Returns:
+            The masked overlap values.
+        """
+        return self.user_comparisons[user_id].apply(
+            self.overlap.rows(rows, cols), rows, cols)
 
     def get_comparison(self, user_id: str) -> List[Union[int, float, str]]:
         """
@@ -358,54 +947,176 @@ class TrueSkill (SortingAlgorithm):
         max_sum = 0
         comparisons = []
 
+        self.sync_overlap()
+
         if user_id not in self.user_comparisons:
-            self.user_comparisons[user_id] = np.ones(self.overlap_matrix.shape)
+            self.user_comparisons[user_id] = ComparedPairs()
 
         if self.random_comparisons and self.comparison_size == 2:
             comparisons = random.sample(range(self.n), 2)
-        else:
-
-            masked_overlap_matrix = np.multiply(
-                self.overlap_matrix, self.user_comparisons[user_id])
+        elif getattr(self, 'pair_selection', "overlap") == "information":
+            comparisons = self.get_information_comparison(user_id)
+        elif self.overlap.kind == ovl.WindowOverlap.kind:
+            comparisons = self.get_window_comparison(user_id)
+        elif self.comparison_size == 2:
+            pair_index = self.get_pair_index(user_id)
+            rows_fn = functools.partial(self.masked_overlap_rows, user_id)
 
-            if self.same_comp_amount and self.comparison_size == 2:
-                arg_sorted_comps = np.argsort(self.comp_tracker)
-                i = arg_sorted_comps[0]
+            if self.same_comp_amount:
+                i = self.comp_tracker.least()
 
-                max_index = np.argmax(
-                    masked_overlap_matrix[i])
+                max_index, _ = pair_index.best_in_row(i, rows_fn)
 
                 if i == max_index:
-                    max_index = np.argpartition(masked_overlap_matrix[i], 2)[1]
+                    max_index = np.argpartition(rows_fn([i])[0], 2)[1]
 
                 comparisons = [i, max_index]
             else:
-                for i in range(self.n):
-                    if self.comparison_size == 2:
+                i, max_index, max_value = pair_index.best_pair(rows_fn)
 
-                        max_index = np.argmax(masked_overlap_matrix[i])
+                if max_value > max_sum:
+                    comparisons = [i, max_index]
+        else:
+            comparisons = self.get_group_comparison(user_id)
 
-                        if masked_overlap_matrix[i][max_index] > max_sum:
+        keys_output = [self.data[c] for c in comparisons]
 
-                            max_sum = masked_overlap_matrix[i][max_index]
-                            comparisons = [i, max_index]
+        return keys_output
+
+    def get_group_comparison(self, user_id: str) -> List[int]:
+        """
+        Get the group of items with the largest overlap sum for a user, where
+        every row of the masked overlap matrix proposes its item together with
+        the comparison_size - 1 items it overlaps most. The rows are processed
+        in blocks, with one argpartition per block.
 
-                    else:
-                        indices = np.argpartition(
-                            self.overlap_matrix[i], -self.comparison_size+1)[
-                                -self.comparison_size+1:]
-                        indices = [
-                            ind for ind in indices
-                            if self.overlap_matrix[i][ind] > 0]
+        Args:
+            user_id: The ID of the user.
 
-                        sum_i = sum(self.overlap_matrix[i][indices])
-                        if max_sum < sum_i:
-                            max_sum = sum_i
-                            comparisons = [i] + list(indices)
+        Returns:
+            A list containing the indices of the items to be compared.
+        """
+        size = self.comparison_size - 1
+        max_sum = 0
+        comparisons = []
 
-        keys_output = [list(self.ratings.keys())[c] for c in comparisons]
+        step = ovl.block_rows(self.n)
+        for start in range(0, self.n, step):
+            rows = np.arange(start, min(start + step, self.n))
+            block = self.masked_overlap_rows(user_id, rows)
 
-        return keys_output
+            indices = np.argpartition(block, -size, axis=1)[:, -size:]
+            values = np.take_along_axis(block, indices, axis=1)
+            sums = np.where(values > 0, values, 0).sum(axis=1)
+
+            r_i = int(np.argmax(sums))
+            if max_sum < sums[r_i]:
+                max_sum = sums[r_i]
+                comparisons = [int(rows[r_i])] + list(
+                    indices[r_i][values[r_i] > 0])
+
+        return comparisons
+
+    def get_window_comparison(self, user_id: str) -> List[int]:
+        """
+        Get the next comparison of a user when only the closest neighbours in
+        mu are scored, following the same rules as the full overlap matrix.
+
+        Args:
+            user_id: The ID of the user.
+
+        Returns:
+            A list containing the indices of the items to be compared.
+        """
+        band = self.overlap.masked_band(self.user_comparisons[user_id])
+
+        if self.comparison_size == 2 and self.same_comp_amount:
+            i = self.comp_tracker.least()
+            items, values = self.overlap.neighbours(band, i)
+
+            if not len(items):
+                return []
+            return [i, items[np.argmax(values)]]
+
+        if self.comparison_size == 2:
+            rank, offset = np.unravel_index(np.argmax(band), band.shape)
+
+            if band[rank, offset] > 0:
+                return list(self.overlap.pair(rank, offset))
+            return []
+
+        size = self.comparison_size - 1
+        offsets = np.argpartition(band, -size, axis=1)[:, -size:]
+        values = np.take_along_axis(band, offsets, axis=1)
+        sums = np.where(values > 0, values, 0).sum(axis=1)
+
+        rank = np.argmax(sums)
+        if sums[rank] <= 0:
+            return []
+
+        return [self.overlap.order[rank]] + [
+            self.overlap.order[rank + offset + 1]
+            for offset in offsets[rank][values[rank] > 0]]
+
+    def get_information_comparison(self, user_id: str) -> List[int]:
+        """
+        Get the comparison of a user with the largest expected information
+        gain. Every item is paired with the INFORMATION_WINDOW items following
+        it in mu, and the pairs the user has not compared yet are scored at
+        once. Larger comparisons add the best scored partners of the best
+        pair.
+
+        Args:
+            user_id: The ID of the user.
+
+        Returns:
+            A list containing the indices of the items to be compared.
+        """
+        order = self.get_ranking().order
+        window = min(self.INFORMATION_WINDOW, self.n - 1)
+
+        ranks = np.arange(self.n)[:, None] + np.arange(1, window + 1)
+        in_range = ranks < self.n
+        items_1 = np.broadcast_to(order[:, None], ranks.shape)[in_range]
+        items_2 = order[ranks[in_range]]
+
+        pair_ids = (np.minimum(items_1, items_2).astype(np.int64) << 32) | \
+            np.maximum(items_1, items_2)
+        candidates = ~np.isin(
+            pair_ids, self.user_comparisons[user_id].pair_ids())
+
+        if self.same_comp_amount:
+            i = self.comp_tracker.least()
+            candidates &= (items_1 == i) | (items_2 == i)
+
+        items_1 = items_1[candidates]
+        items_2 = items_2[candidates]
+        if not len(items_1):
+            return []
+
+        mus, sigmas = self.rating_arrays()
+        gains = rating_update.expected_entropy_reduction(
+            mus[items_1], sigmas[items_1], mus[items_2], sigmas[items_2])
+
+        best = int(np.argmax(gains))
+        comparisons = [int(items_1[best]), int(items_2[best])]
+
+        if self.comparison_size > 2:
+            # the partners of the best pair, from the best scored pair down
+            pair = list(comparisons)
+            involved = np.flatnonzero(
+                np.isin(items_1, pair) | np.isin(items_2, pair))
+            involved = involved[np.argsort(-gains[involved], kind="stable")]
+
+            for c in involved.tolist():
+                partner = int(
+                    items_2[c] if items_1[c] in pair else items_1[c])
+                if partner not in comparisons:
+                    comparisons.append(partner)
+                if len(comparisons) == self.comparison_size:
+                    break
+
+        return comparisons
 
     def inference(
             self, user_id: str, keys: List[Union[int, float, str]],
@@ -418,13 +1129,57 @@ class TrueSkill (SortingAlgorithm):
             keys: The keys of the items compared by the user.
             diff_lvls: The difference levels asessed by the user.
         """
+        self.sync_overlap()
+
+        if user_id not in self.user_comparisons:
+            self.user_comparisons[user_id] = ComparedPairs()
+
+        if (getattr(self, 'update_mode', "pairwise") == "ranked" and
+                len(keys) > 2):
+            rated = self.rate_ranked(keys, diff_lvls)
+        else:
+            rated = self.rate_pairwise(keys, diff_lvls)
+
+        for (i, j) in rated:
+            key_i = self.key_index[keys[i]]
+            key_j = self.key_index[keys[j]]
+
+            if self.same_comp_amount:
+                self.comp_tracker.increment(key_i)
+                self.comp_tracker.increment(key_j)
+
+            self.user_comparisons[user_id].add(key_i, key_j)
+
+        ranking = self.get_ranking()
+        for key in keys:
+            ranking.update(self.key_index[key], self.ratings[key].mu)
+
+        self.update_overlap_rows(keys)
+
+        self.comp_count += 1
+
+    def rate_pairwise(
+            self, keys: List[Union[int, float, str]],
+            diff_lvls: List[object]) -> List[List[int]]:
+        """
+        Update the ratings with a two player match for every pair of the
+        ordering, shuffled with a fixed seed. Major differences are counted
+        twice.
+
+        Args:
+            keys: The keys of the compared items, from lowest to highest.
+            diff_lvls: The difference levels between consecutive keys.
 
+        Returns:
+            The positions in keys of the pairs of every match.
+        """
         to_update = []
 
         for i in range(len(keys)):
-            j = i + 1
-            while j < len(keys):
-                update = max([diff_lvl.value for diff_lvl in diff_lvls][i:j])
+            update = 0
+            for j in range(i + 1, len(keys)):
+                # the largest difference level between the keys i and j
+                update = max(update, diff_lvls[j - 1].value)
 
                 if update == 0:
                     to_update.append(([i, j], True))
@@ -433,35 +1188,78 @@ class TrueSkill (SortingAlgorithm):
                     to_update.append(([i, j], False))
                     if update == 2:
                         to_update.append(([i, j], False))
-                j += 1
 
         random.Random(6).shuffle(to_update)
 
-        if user_id not in self.user_comparisons:
-            self.user_comparisons[user_id] = np.ones(self.overlap_matrix.shape)
+        # updates sharing no item are applied together, in the shuffled order
+        for layer in rating_update.independent_layers(
+                pair for pair, _ in to_update):
+            self.rate_1vs1(
+                [keys[to_update[u][0][1]] for u in layer],
+                [keys[to_update[u][0][0]] for u in layer],
+                [to_update[u][1] for u in layer])
 
-        for ([i, j], is_draw) in to_update:
-            if is_draw:
-                self.ratings[keys[j]], self.ratings[keys[i]] = rate_1vs1(
-                    self.ratings[keys[j]], self.ratings[keys[i]], drawn=True)
-            else:
-                self.ratings[keys[j]], self.ratings[keys[i]] = rate_1vs1(
-                    self.ratings[keys[j]], self.ratings[keys[i]])
+        return [pair for pair, _ in to_update]
 
-            key_i = self.data.index(keys[i])
-            key_j = self.data.index(keys[j])
+    def rate_ranked(
+            self, keys: List[Union[int, float, str]],
+            diff_lvls: List[object]) -> List[List[int]]:
+        """
+        Update the ratings by treating the ordering as a single ranked match
+        between all items, where equal items share a rank. Every major
+        difference adds a two player match between the consecutive items.
 
-            if self.same_comp_amount:
-                self.comp_tracker[key_i] += 1
-                self.comp_tracker[key_j] += 1
+        Args:
+            keys: The keys of the compared items, from lowest to highest.
+            diff_lvls: The difference levels between consecutive keys.
 
-            self.user_comparisons[user_id][key_i, key_j] = 0
-            self.user_comparisons[user_id][key_j, key_i] = 0
+        Returns:
+            The positions in keys of the pairs whose ratings were compared.
+        """
+        # the highest key has rank 0, equal keys share a rank
+        ranks = [0] * len(keys)
+        for i in range(len(keys) - 2, -1, -1):
+            ranks[i] = ranks[i + 1] + (diff_lvls[i] != DiffLevel.none)
 
-        for k in keys:
-            self.update_overlap_matrix(k)
+        rated = trueskill.rate(
+            [(self.ratings[key],) for key in keys], ranks=ranks)
+        for key, (rating,) in zip(keys, rated):
+            self.ratings[key] = rating
 
-        self.comp_count += 1
+        majors = [i for i, diff_lvl in enumerate(diff_lvls)
+                  if diff_lvl == DiffLevel.major]
+        for layer in rating_update.independent_layers(
+                (i, i + 1) for i in majors):
+            self.rate_1vs1(
+                [keys[majors[u] + 1] for u in layer],
+                [keys[majors[u]] for u in layer], [False] * len(layer))
+
+        return [[i, j] for i in range(len(keys))
+                for j in range(i + 1, len(keys))] + [
+                    [i, i + 1] for i in majors]
+
+    def rate_1vs1(
+            self, winners: List[Union[int, float, str]],
+            losers: List[Union[int, float, str]], drawn: List[bool]):
+        """
+        Update the ratings after independent matches between two items, in
+        one vectorized step. No item may take part in more than one match.
+
+        Args:
+            winners: The keys of the winning items.
+            losers: The keys of the losing items.
+            drawn: Whether each match was a draw.
+        """
+        mus_1, sigmas_1 = rating_arrays(self.ratings, winners)
+        mus_2, sigmas_2 = rating_arrays(self.ratings, losers)
+
+        mus_1, sigmas_1, mus_2, sigmas_2 = rating_update.rate_1vs1(
+            mus_1, sigmas_1, mus_2, sigmas_2, drawn)
+
+        for key, mu, sigma in zip(
+                winners + losers, np.concatenate((mus_1, mus_2)),
+                np.concatenate((sigmas_1, sigmas_2))):
+            self.ratings[key] = Rating(float(mu), float(sigma))
 
     def get_result(self) -> List[Union[int, float, str]]:
         """
@@ -470,7 +1268,44 @@ class TrueSkill (SortingAlgorithm):
         Returns:
             A list of items sorted based on the TrueSkill algorithm.
         """
-        return [k for k, _ in sorted(self.ratings.items(), key=lambda x: x[1])]
+        return [self.data[i] for i in self.get_ranking().order]
+
+    def get_ranking(self) -> RankingIndex:
+        """
+        Get the ranking of the items by mu, which is kept up to date by the
+        inference step. Algorithms loaded from older saves receive a ranking
+        built from their ratings.
+
+        Returns:
+            The RankingIndex of the items.
+        """
+        if getattr(self, 'ranking', None) is None:
+            self.ranking = RankingIndex(self.rating_arrays()[0])
+        return self.ranking
+
+    def get_rank(self, key: Union[int, float, str]) -> int:
+        """
+        Get the current position of an item in the sorted result.
+
+        Args:
+            key: The key of the item.
+
+        Returns:
+            The number of items currently ranked below the item.
+        """
+        return self.get_ranking().rank(self.key_index[key])
+
+    def get_top(self, k: int) -> List[Union[int, float, str]]:
+        """
+        Get the currently highest ranked items.
+
+        Args:
+            k: The number of items.
+
+        Returns:
+            The keys of the k highest ranked items, highest first.
+        """
+        return [self.data[i] for i in self.get_ranking().top(k)]
 
     def is_finished(self) -> bool:
         """
@@ -479,9 +1314,10 @@ class TrueSkill (SortingAlgorithm):
         Returns:
             True if the sorting process is finished, False otherwise.
         """
+        if self.comp_count >= self.comparison_max:
+            return True
 
-        if (self.comp_count >= self.comparison_max or
-                self.overlap_matrix.max() <= 0):
+        if self.max_overlap() <= 0:
             return True
 
         return False
@@ -496,7 +1332,27 @@ class TrueSkill (SortingAlgorithm):
         Returns:
             True if a comparison is available, False otherwise.
         """
-        return not self.is_finished() or not self.get_comparison(user_id)
+        if self.is_finished() or self.n < self.comparison_size:
+            return False
+
+        if self.comparison_size == 2:
+            indexed = not self.random_comparisons and \
+                not self.same_comp_amount
+        else:
+            # a group is only proposed around an uncompared pair that
+            # overlaps
+            indexed = True
+
+        # the largest overlap left to the user is kept by its pair index, so
+        # no comparison has to be selected for the check
+        if (indexed and
+                getattr(self, 'pair_selection', "overlap") == "overlap" and
+                self.overlap.kind != ovl.WindowOverlap.kind and
+                user_id in self.user_comparisons):
+            rows_fn = functools.partial(self.masked_overlap_rows, user_id)
+            return self.get_pair_index(user_id).best_pair(rows_fn)[2] > 0
+
+        return True
 
     def get_comparison_count(self) -> int:
         """
@@ -518,22 +1374,77 @@ class TrueSkill (SortingAlgorithm):
 
 
 class RatingAlgorithm (SortingAlgorithm):
-    """Implementation of the rating algorithm"""
+    """
+    Implementation of the rating algorithm. By default every user rates every
+    item. With a quota of ratings per item the items are shared between the
+    users instead. Users are given the open items with the fewest ratings
+    first, and an item leaves all queues once it has been rated often enough.
+    """
 
-    def __init__(self, data: List[Union[int, float, str]]):
+    def __init__(
+            self, data: List[Union[int, float, str]],
+            ratings_per_item: Optional[int] = None):
         """
         Initialize the RatingAlgorithm.
 
         Args:
             data: The data to be rated.
+            ratings_per_item: The number of independent ratings needed per
+                              item, None if every user rates every item.
         """
         self.n = len(data)
         self.data = list(data)
+        self.index = {key: i for i, key in enumerate(self.data)}
 
         self.comp_count = 0
         self.comparison_size = 1
         self.user_ratings = {}
 
+        self.ratings_per_item = ratings_per_item
+        self.item_counts = np.zeros(self.n, dtype=np.int32)
+        self.closed = None
+        self.closed_count = 0
+        if ratings_per_item is not None:
+            self.closed = np.zeros(self.n, dtype=bool)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # the index is rebuilt when loading in order to keep the pickle small
+        state.pop("index")
+        return state
+
+    def __setstate__(self, state: dict):
+        """
+        Restores a pickled RatingAlgorithm object, converting the per user
+        lists of older saves into queues that keep their order.
+
+        Args:
+            state: The pickled attributes of the object.
+        """
+        self.__dict__.update(state)
+        self.index = {key: i for i, key in enumerate(self.data)}
+
+        for user_id, user in self.user_ratings.items():
+            if isinstance(user, RatingQueue):
+                continue
+
+            rated = [(self.index[key], value)
+                     for key, value in user['rated'].items()]
+            queue = RatingQueue(
+                self.n, order=[i for i, _ in rated] +
+                [self.index[key] for key in user['toRate']])
+            for i, value in rated:
+                queue.rate(i, value)
+            self.user_ratings[user_id] = queue
+
+        if "item_counts" not in state:
+            self.ratings_per_item = None
+            self.item_counts = np.zeros(self.n, dtype=np.int32)
+            for queue in self.user_ratings.values():
+                self.item_counts += queue.values != UNRATED
+            self.closed = None
+            self.closed_count = 0
+
     def get_comparison(self, user_id: str) -> List[Union[int, float, str]]:
         """
         Get a comparison for a user.
@@ -544,27 +1455,29 @@ class RatingAlgorithm (SortingAlgorithm):
         Returns:
             A list containing the key of the item to be rated by the user.
         """
-        user_dict = self.get_user(user_id)
-        if user_dict['toRate']:
-            return user_dict['toRate'][0]
+        if self.closed is not None:
+            i = self.get_user(user_id).least_rated(
+                self.item_counts, self.closed)
+        else:
+            i = self.get_user(user_id).head()
+        if i is not None:
+            return self.data[i]
         return []
 
-    def get_user(self, user_id: str) -> Dict[str, Any]:
+    def get_user(self, user_id: str) -> RatingQueue:
         """
-        Get the user's dictionary.
+        Get the rating queue of a user, which is created with a seed derived
+        from the user ID if the user is new.
 
         Args:
             user_id: The ID of the user.
 
         Returns:
-            The dictionary containing the user's data.
+            The queue holding the ratings of the user.
         """
         if user_id not in self.user_ratings:
-            user_hash = abs(hash(user_id)) % (10 ** 8)
-            to_sort = copy.deepcopy(self.data)
-            random.Random(user_hash).shuffle(to_sort)
-            self.user_ratings[user_id] = {
-                'toRate': to_sort, 'rated': {}}
+            self.user_ratings[user_id] = RatingQueue(
+                self.n, user_seed(user_id))
         return self.user_ratings[user_id]
 
     def inference(
@@ -575,16 +1488,20 @@ class RatingAlgorithm (SortingAlgorithm):
 
         Args:
             user_id: The ID of the user.
-            keys: The keys of the items compared by the user.
-            diff_lvls: The difference levels asessed by the user.
+            key: The key of the item rated by the user.
+            rating: The rating assessed by the user to the item.
         """
 
-        user_dict = self.get_user(user_id)
+        i = self.index.get(key)
 
-        if key in user_dict['toRate']:
-            user_dict['toRate'].remove(key)
-            user_dict['rated'][key] = rating
+        if i is not None and self.get_user(user_id).rate(i, rating):
             self.comp_count += 1
+            self.item_counts[i] += 1
+
+            if self.closed is not None and not self.closed[i] and \
+                    self.item_counts[i] >= self.ratings_per_item:
+                self.closed[i] = True
+                self.closed_count += 1
 
     def get_result(self) -> Dict[str, Dict[Union[int, float, str], Any]]:
         """
@@ -606,17 +1523,31 @@ class RatingAlgorithm (SortingAlgorithm):
         Returns:
             A dictionary containing the rated items for the user.
         """
-        user_dict = self.get_user(user_id)
-        return user_dict['rated']
+        return {self.data[i]: value
+                for i, value in self.get_user(user_id).rated()}
+
+    def get_rating_matrix(self) -> RatingMatrix:
+        """
+        Get the ratings of all users as a users x items matrix.
+
+        Returns:
+            The matrix of the ratings, with the items in the order of data.
+        """
+        users = list(self.user_ratings)
+        values = np.empty((len(users), self.n), dtype=np.int16)
+        for row, user_id in enumerate(users):
+            values[row] = self.user_ratings[user_id].values
+        return RatingMatrix(users, self.data, values)
 
     def is_finished(self) -> bool:
         """
         Check if the sorting process is finished.
 
         Returns:
-            False (the rating algorithm never finishes)
+            True if every item has reached its quota of ratings, always False
+            without a quota.
         """
-        return False  # never finished
+        return self.closed is not None and self.closed_count == self.n
 
     def comparison_is_available(self, user_id: str) -> bool:
         """
@@ -628,10 +1559,7 @@ class RatingAlgorithm (SortingAlgorithm):
         Returns:
             True if a comparison is available, False otherwise.
         """
-        user_dict = self.get_user(user_id)
-        if len(user_dict['toRate']):
-            return True
-        return False
+        return self.get_user(user_id).head(self.closed) is not None
 
     def get_comparison_count(self) -> int:
         """
@@ -647,17 +1575,31 @@ class RatingAlgorithm (SortingAlgorithm):
         Get the maximum number of comparisons allowed.
 
         Returns:
-            The maximum number of comparisons allowed.
+            The number of ratings needed from all users together with a quota,
+            the number of ratings per user otherwise.
         """
+        if self.ratings_per_item is not None:
+            return len(self.data) * self.ratings_per_item
         return len(self.data)
 
 
 class HybridTrueSkill (SortingAlgorithm):
-    """Implementation of the rating and TrueSkill hybrid algorithm"""
+    """
+    Implementation of the rating and TrueSkill hybrid algorithm. With a mix
+    ratio, ranking comparisons are mixed into the rating phase. They are made
+    in a TrueSkill pool of the items rated so far, which grows as the rating
+    phase goes on and becomes the TrueSkill phase once every item is rated.
+    """
+
+    # the fraction of its size the pool has to be able to grow by before it
+    # is rebuilt, which bounds the total cost of rebuilding
+    POOL_GROWTH = 0.25
 
     def __init__(
             self, data: List[Union[int, float, str]],
-            comparison_size: int = 2, comparison_max: Optional[int] = None):
+            comparison_size: int = 2, comparison_max: Optional[int] = None,
+            overlap_path: Optional[str] = None,
+            update_mode: str = "pairwise", mix_ratio: Optional[float] = None):
         """
         Initialize the HybridTrueSkill algorithm.
 
@@ -665,14 +1607,25 @@ class HybridTrueSkill (SortingAlgorithm):
             data: The data to be sorted.
             comparison_size: The size of each comparison.
             comparison_max: The maximum number of comparisons allowed.
+            overlap_path: The file backing the overlap matrix of the TrueSkill
+                          phase if it is large enough to be memory mapped.
+            update_mode: The update mode of the TrueSkill phase, "pairwise"
+                         or "ranked".
+            mix_ratio: The fraction of the comparisons of the rating phase
+                       that are ranking comparisons, None to only rank after
+                       every item is rated.
         """
 
         self.data = data
         self.comparison_size = comparison_size
         self.comparison_max = comparison_max
+        self.overlap_path = overlap_path
+        self.update_mode = update_mode
+        self.mix_ratio = mix_ratio
 
         self.sort_alg = RatingAlgorithm(data)
         self.is_rating = True
+        self.pool = None
 
     def get_comparison(self, user_id: str) -> List[Union[int, float, str]]:
         """
@@ -684,11 +1637,148 @@ class HybridTrueSkill (SortingAlgorithm):
         Returns:
             A list containing the key of the item to be compared by the user.
         """
-        return self.sort_alg.get_comparison("hybrid")
+        return self.get_phase_algorithm().get_comparison("hybrid")
+
+    def get_phase_algorithm(self) -> SortingAlgorithm:
+        """
+        Get the algorithm that serves the next comparison.
+
+        Returns:
+            The RatingAlgorithm if the next comparison is a rating, the
+            TrueSkill pool or model if it is a ranking.
+        """
+        self.complete_transition()
+
+        if self.ranking_due():
+            self.update_pool()
+            if self.pool is not None and \
+                    self.pool.comparison_is_available("hybrid"):
+                return self.pool
+
+        return self.sort_alg
+
+    def ranking_due(self) -> bool:
+        """
+        Check if a ranking comparison should be mixed in next, which is the
+        case while the ranking comparisons are behind the mix ratio.
+
+        Returns:
+            True if the next comparison should be a ranking, False otherwise.
+        """
+        mix_ratio = getattr(self, 'mix_ratio', None)
+        if not self.is_rating or not mix_ratio:
+            return False
+
+        pool = getattr(self, 'pool', None)
+        ranked = pool.comp_count if pool is not None else 0
+        return ranked * (1 - mix_ratio) < \
+            mix_ratio * self.sort_alg.comp_count
+
+    def update_pool(self):
+        """
+        Adds the items rated since the pool was built to the pool, once there
+        are enough of them.
+        """
+        values = self.sort_alg.get_user("hybrid").values
+        rated = int(np.count_nonzero(values > 1))
+        pool = getattr(self, 'pool', None)
+
+        if pool is None:
+            if rated < self.comparison_size:
+                return
+        elif rated - pool.n < max(1, self.POOL_GROWTH * pool.n):
+            return
+
+        ratings = self.rated_items()
+
+        storage = ovl.partitioned_storage(list(ratings.values()))
+        # a memory mapped pool could not be regrown in its file
+        if storage == "memmap":
+            storage = "window"
+
+        self.pool = self.grow_pool(
+            ratings, len(ratings) * 4, storage, None)
+
+    def rated_items(self) -> Dict[Union[int, float, str], Any]:
+        """
+        Get the ratings of the rated items that take part in the ranking.
+
+        Returns:
+            A dictionary of the ratings of the rated items, in the order of
+            the rating queue. Items rated out of turn are not in the order
+            they were rated.
+        """
+        return {
+            k: v for k, v in self.sort_alg.get_user_result("hybrid").items()
+            if v > 1}
+
+    def rated_mus(self, ratings: Dict[Union[int, float, str], Any]
+                  ) -> Dict[Union[int, float, str], float]:
+        """
+        Get the prior means of rated items.
+
+        Args:
+            ratings: The ratings of the items.
+
+        Returns:
+            A dictionary of the TrueSkill means of the items, in the order of
+            the ratings.
+        """
+        return {k: self.rating_to_mu(v) for k, v in ratings.items()}
+
+    def grow_pool(
+            self, ratings: Dict[Union[int, float, str], Any],
+            comparison_max: int, overlap_storage: str,
+            overlap_path: Optional[str]) -> TrueSkill:
+        """
+        Builds a TrueSkill model of the given items without changing the
+        state of the algorithm. Items already in the pool keep their ratings
+        and comparisons, the other items start from the prior mean of their
+        rating. The ratings are the buckets of a bucketed overlap storage.
+
+        Args:
+            ratings: The ratings of the items.
+            comparison_max: The maximum number of comparisons of the model.
+            overlap_storage: The kind of storage of the overlap matrix.
+            overlap_path: The file backing a memory mapped overlap matrix.
+
+        Returns:
+            The TrueSkill model holding the items.
+        """
+        results = self.rated_mus(ratings)
+        pool = getattr(self, 'pool', None)
+
+        if pool is None:
+            return TrueSkill(
+                results.keys(),
+                comparison_size=self.comparison_size,
+                comparison_max=comparison_max, initial_mus=results,
+                overlap_storage=overlap_storage, overlap_path=overlap_path,
+                update_mode=getattr(self, 'update_mode', "pairwise"),
+                overlap_buckets=ratings)
+
+        keys = list(pool.data) + [k for k in results if k not in pool.ratings]
+        mus = dict(results)
+        sigmas = {k: Rating().sigma for k in keys}
+        for k in pool.data:
+            mus[k] = pool.ratings[k].mu
+            sigmas[k] = pool.ratings[k].sigma
+
+        # the items of the pool keep their indices, so their compared pairs
+        # remain valid, the order of the items added after them is arbitrary
+        grown = TrueSkill(
+            keys, comparison_size=self.comparison_size,
+            comparison_max=comparison_max, initial_mus=mus,
+            initial_std=sigmas, overlap_storage=overlap_storage,
+            overlap_path=overlap_path, update_mode=pool.update_mode,
+            overlap_buckets=ratings)
+        grown.comp_count = pool.comp_count
+        grown.user_comparisons = copy.deepcopy(pool.user_comparisons)
+        return grown
 
     def inference(
             self, user_id: str, key: Union[int, float, str],
-            rating: Any):
+            rating: Any, transition: bool = True):
         """
         Perform the inference step based on the user's assessments.
 
@@ -696,15 +1786,23 @@ class HybridTrueSkill (SortingAlgorithm):
             user_id: The ID of the user.
             key: The key of the item compared by the user.
             rating: The rating assessed by the user to the item.
+            transition: Whether to change to TrueSkill right away after the
+                        last rating. Otherwise the caller is expected to
+                        build the TrueSkill model with build_trueskill and
+                        apply it with set_trueskill.
 
         Returns:
             None
         """
-        self.sort_alg.inference("hybrid", key, rating)
+        if self.is_rating and isinstance(key, list):
+            # a ranking mixed into the rating phase
+            self.update_pool()
+            self.pool.inference("hybrid", key, rating)
+        else:
+            self.sort_alg.inference("hybrid", key, rating)
 
-        if self.is_rating:
-            if not self.sort_alg.comparison_is_available("hybrid"):
-                self.change_to_trueskill("hybrid")
+        if transition:
+            self.complete_transition()
 
     def get_result(self) -> Dict[str, Dict[Union[int, float, str], Any]]:
         """
@@ -734,8 +1832,27 @@ class HybridTrueSkill (SortingAlgorithm):
         Returns:
             True if a comparison is available, False otherwise.
         """
+        self.complete_transition()
         return self.sort_alg.comparison_is_available("hybrid")
 
+    def transition_pending(self) -> bool:
+        """
+        Check if all items are rated but the TrueSkill phase has not started.
+
+        Returns:
+            True if the algorithm should change to TrueSkill, False otherwise.
+        """
+        return self.is_rating and \
+            not self.sort_alg.comparison_is_available("hybrid")
+
+    def complete_transition(self):
+        """
+        Changes to TrueSkill if all items are rated and the change has not
+        been made yet.
+        """
+        if self.transition_pending():
+            self.change_to_trueskill("hybrid")
+
     def change_to_trueskill(self, user_id: str):
         """
         Change the algorithm to use the TrueSkill method.
@@ -743,15 +1860,39 @@ class HybridTrueSkill (SortingAlgorithm):
         Args:
             user_id: The ID of the user.
         """
-        results = {
-            k: self.rating_to_mu(v) for k,
-            v in self.sort_alg.get_user_result("hybrid").items() if v > 1}
+        self.set_trueskill(self.build_trueskill())
+
+    def build_trueskill(self) -> TrueSkill:
+        """
+        Builds the TrueSkill model of the ranking phase from the ratings,
+        without changing the state of the algorithm. This is the expensive
+        part of the transition, so it may run in a background thread as long
+        as no ratings are added meanwhile.
+
+        Returns:
+            The TrueSkill model initialized with the ratings, continuing from
+            the pool if ranking comparisons were mixed in.
+        """
+        ratings = self.rated_items()
 
-        self.sort_alg = TrueSkill(
-            results.keys(),
-            comparison_size=self.comparison_size,
-            comparison_max=len(results.keys()) * 4, initial_mus=results)
+        return self.grow_pool(
+            ratings, len(ratings.keys()) * 4,
+            ovl.partitioned_storage(list(ratings.values())),
+            getattr(self, 'overlap_path', None))
+
+    def set_trueskill(self, sort_alg: TrueSkill):
+        """
+        Starts the ranking phase with a TrueSkill model built by
+        build_trueskill.
+
+        Args:
+            sort_alg: The TrueSkill model of the ranking phase.
+        """
+        # the ratings are kept for the rating distribution
+        self.rating_alg = self.sort_alg
+        self.sort_alg = sort_alg
         self.is_rating = False
+        self.pool = None
 
     def rating_to_mu(self, rating: int) -> float:
         """
@@ -777,6 +1918,8 @@ class HybridTrueSkill (SortingAlgorithm):
         total = self.sort_alg.get_comparison_count()
         if not self.is_rating:
             total += len(self.data)
+        elif getattr(self, 'pool', None) is not None:
+            total += self.pool.comp_count
 
         return total
 
@@ -791,5 +1934,8 @@ class HybridTrueSkill (SortingAlgorithm):
         total = self.sort_alg.get_comparison_max()
         if not self.is_rating:
             total += len(self.data)
+        elif getattr(self, 'mix_ratio', None):
+            # the rankings expected to be mixed into the rating phase
+            total += int(total * self.mix_ratio / (1 - self.mix_ratio))
 
         return total
@@ -0,0 +1,141 @@
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+class ComparedPairs:
+    """
+    Sparse set of the pairs of items that a user has already compared. Memory
+    grows with the number of comparisons made rather than with the square of
+    the number of items.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty ComparedPairs.
+        """
+        self.neighbours: Dict[int, Set[int]] = {}
+        self.ids: List[int] = []
+        self.count = 0
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> 'ComparedPairs':
+        """
+        Creates a ComparedPairs from a dense mask where compared pairs are 0.
+
+        Args:
+            mask (ndarray): An n x n matrix of ones and zeros.
+
+        Returns:
+            ComparedPairs: The pairs that are zero in the mask.
+        """
+        compared = cls()
+        for i, j in zip(*np.nonzero(np.triu(mask == 0, 1))):
+            compared.add(int(i), int(j))
+        return compared
+
+    def add(self, i: int, j: int):
+        """
+        Marks a pair of items as compared.
+
+        Args:
+            i (int): The index of the first item.
+            j (int): The index of the second item.
+        """
+        i, j = int(i), int(j)
+        if (i, j) in self:
+            return
+
+        self.neighbours.setdefault(i, set()).add(j)
+        self.neighbours.setdefault(j, set()).add(i)
+        self.ids.append((min(i, j) << 32) | max(i, j))
+        self.count += 1
+
+    def __contains__(self, pair: Tuple[int, int]) -> bool:
+        i, j = pair
+        return int(j) in self.neighbours.get(int(i), ())
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        for i, neighbours in self.neighbours.items():
+            for j in neighbours:
+                if i < j:
+                    yield i, j
+
+    def compared_with(self, i: int) -> Set[int]:
+        """
+        Get the items that have been compared with an item.
+
+        Args:
+            i (int): The index of the item.
+
+        Returns:
+            Set[int]: The indices of the items compared with item i.
+        """
+        return self.neighbours.get(int(i), set())
+
+    def apply(
+            self, block: np.ndarray, rows: np.ndarray,
+            cols: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Sets the elements of a block of a matrix belonging to compared pairs
+        to zero, in place.
+
+        Args:
+            block (ndarray): The values of the given rows and columns.
+            rows (ndarray): The row indices of the block.
+            cols (Optional[ndarray]): The column indices of the block, all
+                                      columns if None.
+
+        Returns:
+            ndarray: The masked block.
+        """
+        row_positions = []
+        neighbours = []
+        for r_i, row in enumerate(np.asarray(rows).tolist()):
+            row_neighbours = self.neighbours.get(row)
+            if row_neighbours:
+                row_positions.extend([r_i] * len(row_neighbours))
+                neighbours.extend(row_neighbours)
+
+        if not neighbours:
+            return block
+
+        row_positions = np.array(row_positions, dtype=np.intp)
+        neighbours = np.array(neighbours, dtype=np.intp)
+
+        if cols is None:
+            block[row_positions, neighbours] = 0
+        else:
+            cols = np.asarray(cols)
+            order = np.argsort(cols, kind="stable")
+            sorted_cols = cols[order]
+            positions = np.minimum(
+                np.searchsorted(sorted_cols, neighbours), len(cols) - 1)
+            hits = sorted_cols[positions] == neighbours
+            block[row_positions[hits], order[positions[hits]]] = 0
+
+        return block
+
+    def pair_ids(self) -> np.ndarray:
+        """
+        Get the compared pairs packed into single integers.
+
+        Returns:
+            ndarray: The pairs (i, j) with i < j packed as i << 32 | j.
+        """
+        ids = np.array(self.ids, dtype=np.int64)
+        ids.sort()
+        return ids
+
+    def __getstate__(self) -> dict:
+        return {"pair_ids": self.pair_ids()}
+
+    def __setstate__(self, state: dict):
+        self.neighbours = {}
+        self.ids = []
+        self.count = 0
+        for pair_id in state["pair_ids"].tolist():
+            self.add(pair_id >> 32, pair_id & 0xFFFFFFFF)
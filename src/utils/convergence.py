@@ -1,9 +1,9 @@
-import math
 from typing import List
 
 import numpy as np
 
 import sorting_algorithms as sa
+import utils.rating_store as rating_store
 import utils.recomputation as recomp
 import utils.saves_handler as saves_handler
 
@@ -65,10 +65,7 @@ def rmses_inference(save: dict, prev_ratings: dict, sort_alg: sa.TrueSkill):
         sort_alg (TrueSkill): The TrueSkill sorting algorithm.
     """
     update_convergence_save(save)
-    rmse = math.sqrt(
-        sum(
-            (prev_ratings[key].mu - sort_alg.ratings[key].mu) ** 2
-            for key in sort_alg.data) / sort_alg.n)
+    rmse = rating_store.rmse(prev_ratings, sort_alg.ratings, sort_alg.data)
     save["rmses"].append(rmse)
     saves_handler.save_algorithm_pickle(save)
 
@@ -0,0 +1,55 @@
+import heapq
+from typing import Iterable
+
+import numpy as np
+
+
+class CountQueue:
+    """
+    Priority queue of per-item counts that finds the least counted item in
+    O(log n). Increments push a new heap entry and outdated entries are
+    discarded when they reach the top. Ties are resolved towards the smallest
+    item index.
+    """
+
+    def __init__(self, counts: Iterable[int]):
+        """
+        Initialize the CountQueue.
+
+        Args:
+            counts (Iterable[int]): The initial count of every item.
+        """
+        self.counts = np.array(counts, dtype=np.int64)
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Recreates the heap from the counts, dropping outdated entries.
+        """
+        self.heap = [(int(count), i) for i, count in enumerate(self.counts)]
+        heapq.heapify(self.heap)
+
+    def increment(self, i: int):
+        """
+        Increases the count of an item by one.
+
+        Args:
+            i (int): The index of the item.
+        """
+        self.counts[i] += 1
+        heapq.heappush(self.heap, (int(self.counts[i]), int(i)))
+
+        # outdated entries are bounded by a multiple of the number of items
+        if len(self.heap) > 4 * len(self.counts):
+            self.rebuild()
+
+    def least(self) -> int:
+        """
+        Get the item with the lowest count.
+
+        Returns:
+            int: The smallest index among the items with the lowest count.
+        """
+        while self.heap[0][0] != self.counts[self.heap[0][1]]:
+            heapq.heappop(self.heap)
+        return self.heap[0][1]
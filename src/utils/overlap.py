@@ -0,0 +1,1105 @@
+import os
+import tempfile
+from typing import Optional, Tuple
+
+import numpy as np
+
+from utils.compared_pairs import ComparedPairs
+
+# The number of standard deviations on each side of mu spanned by an interval.
+INTERVAL_STD = 3
+
+# Upper bound on the number of elements in each intermediate block, keeps the
+# peak memory of the blocked computation at tens of megabytes.
+BLOCK_ELEMENTS = 2 ** 20
+
+
+def intervals_overlap(
+        mus_1: np.ndarray, sigmas_1: np.ndarray, mus_2: np.ndarray,
+        sigmas_2: np.ndarray) -> np.ndarray:
+    """
+    Calculates the overlap between the intervals of two sets of ratings. The
+    arguments are broadcast against each other, meaning that a column of
+    ratings compared with a row of ratings produces a matrix of overlaps.
+
+    Args:
+        mus_1 (ndarray): The means of the first set of ratings.
+        sigmas_1 (ndarray): The standard deviations of the first set of ratings.
+        mus_2 (ndarray): The means of the second set of ratings.
+        sigmas_2 (ndarray): The standard deviations of the second set of
+                            ratings.
+
+    Returns:
+        ndarray: The overlap values between the intervals.
+    """
+    low_1 = mus_1 - INTERVAL_STD * sigmas_1
+    high_1 = mus_1 + INTERVAL_STD * sigmas_1
+
+    low_2 = mus_2 - INTERVAL_STD * sigmas_2
+    high_2 = mus_2 + INTERVAL_STD * sigmas_2
+
+    common_gap = np.minimum(high_1, high_2) - np.maximum(low_1, low_2)
+    overall_gap = np.maximum(high_1, high_2) - np.minimum(low_1, low_2)
+    largest_span = np.maximum(high_1 - low_1, high_2 - low_2)
+
+    return common_gap / overall_gap * largest_span
+
+
+def block_rows(n: int, block_size: Optional[int] = None) -> int:
+    """
+    Determines how many rows of an n x n matrix should be computed at once.
+
+    Args:
+        n (int): The number of columns of the matrix.
+        block_size (Optional[int]): An explicit number of rows, if None a
+                                    size bounded by BLOCK_ELEMENTS is used.
+
+    Returns:
+        int: The number of rows per block.
+    """
+    if block_size is None:
+        block_size = BLOCK_ELEMENTS // max(n, 1)
+    return max(1, min(block_size, n))
+
+
+def overlap_rows(
+        rows: np.ndarray, mus: np.ndarray, sigmas: np.ndarray) -> np.ndarray:
+    """
+    Computes the overlap between the given items and all items.
+
+    Args:
+        rows (ndarray): The indices of the items whose rows should be computed.
+        mus (ndarray): The means of all items.
+        sigmas (ndarray): The standard deviations of all items.
+
+    Returns:
+        ndarray: A len(rows) x n matrix of overlap values, where the overlap
+                 of an item with itself is set to -inf.
+    """
+    rows = np.asarray(rows, dtype=np.intp)
+    block = intervals_overlap(
+        mus[rows, None], sigmas[rows, None], mus[None, :], sigmas[None, :])
+    block[np.arange(len(rows)), rows] = -np.inf
+    return block
+
+
+def overlap_matrix(
+        mus: np.ndarray, sigmas: np.ndarray, block_size: Optional[int] = None,
+        out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Computes the full pairwise overlap matrix of the given ratings. The matrix
+    is computed in blocks of rows in order to cap the peak memory usage.
+
+    Args:
+        mus (ndarray): The means of all items.
+        sigmas (ndarray): The standard deviations of all items.
+        block_size (Optional[int]): The number of rows computed at once.
+        out (Optional[ndarray]): An n x n array to write the result into.
+
+    Returns:
+        ndarray: The n x n overlap matrix with -inf along the diagonal.
+    """
+    mus = np.asarray(mus, dtype=np.float64)
+    sigmas = np.asarray(sigmas, dtype=np.float64)
+    n = len(mus)
+
+    if out is None:
+        out = np.empty((n, n))
+
+    step = block_rows(n, block_size)
+    for start in range(0, n, step):
+        rows = np.arange(start, min(start + step, n))
+        out[start:start + len(rows)] = overlap_rows(rows, mus, sigmas)
+
+    return out
+
+
+class OverlapStorage:
+    """Base class for the storages of the symmetric overlap matrix."""
+
+    kind = None
+
+    def update(self, rows: np.ndarray, mus: np.ndarray, sigmas: np.ndarray):
+        """
+        Recomputes the overlap values of items whose ratings have changed.
+
+        Args:
+            rows (ndarray): The sorted indices of the changed items.
+            mus (ndarray): The means of all items.
+            sigmas (ndarray): The standard deviations of all items.
+        """
+        self.set_rows(rows, overlap_rows(rows, mus, sigmas))
+
+    def stale_rows(self) -> np.ndarray:
+        """
+        Get the rows that were overwritten through another object sharing the
+        same underlying storage, and therefore have to be recomputed.
+
+        Returns:
+            ndarray: The indices of the stale rows.
+        """
+        return np.empty(0, dtype=np.intp)
+
+
+class DenseOverlap(OverlapStorage):
+    """Stores the overlap matrix as a full n x n float64 array."""
+
+    kind = "dense"
+
+    def __init__(self, n: int, matrix: Optional[np.ndarray] = None):
+        """
+        Initialize the DenseOverlap.
+
+        Args:
+            n (int): The number of items.
+            matrix (Optional[ndarray]): An existing n x n overlap matrix.
+        """
+        self.n = n
+        self.matrix = np.empty((n, n)) if matrix is None else matrix
+
+    def build(self, mus: np.ndarray, sigmas: np.ndarray):
+        """
+        Computes every overlap value from the given ratings.
+
+        Args:
+            mus (ndarray): The means of all items.
+            sigmas (ndarray): The standard deviations of all items.
+        """
+        overlap_matrix(mus, sigmas, out=self.matrix)
+
+    def fill(self, value: float):
+        """
+        Sets every overlap value to the same value.
+
+        Args:
+            value (float): The overlap between every pair of items.
+        """
+        self.matrix.fill(value)
+        np.fill_diagonal(self.matrix, -np.inf)
+
+    def rows(self, rows: np.ndarray,
+             cols: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Get a block of the overlap matrix.
+
+        Args:
+            rows (ndarray): The indices of the rows.
+            cols (Optional[ndarray]): The indices of the columns, all columns
+                                      if None.
+
+        Returns:
+            ndarray: A float64 copy of the block.
+        """
+        if cols is None:
+            return self.matrix[rows]
+        return self.matrix[np.ix_(rows, cols)]
+
+    def set_rows(self, rows: np.ndarray, block: np.ndarray):
+        """
+        Overwrites complete rows, and thereby the matching columns, of the
+        overlap matrix.
+
+        Args:
+            rows (ndarray): The indices of the rows.
+            block (ndarray): The new len(rows) x n values.
+        """
+        self.matrix[rows, :] = block
+        self.matrix[:, rows] = block.T
+
+    def max(self) -> float:
+        """
+        Get the largest overlap value.
+
+        Returns:
+            float: The largest value of the matrix.
+        """
+        return self.matrix.max()
+
+
+class PackedOverlap(OverlapStorage):
+    """
+    Stores the strict upper triangle of the overlap matrix as a flat float32
+    array, roughly a quarter of the memory of DenseOverlap. Values are read
+    back as float64 with -inf along the diagonal.
+    """
+
+    kind = "packed"
+
+    def __init__(self, n: int, values: Optional[np.ndarray] = None):
+        """
+        Initialize the PackedOverlap.
+
+        Args:
+            n (int): The number of items.
+            values (Optional[ndarray]): Existing packed overlap values.
+        """
+        self.n = n
+        if values is None:
+            values = np.empty(n * (n - 1) // 2, dtype=np.float32)
+        self.values = values
+
+    def positions(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """
+        Get the positions of the given elements within the packed array.
+
+        Args:
+            rows (ndarray): The row indices, broadcast against cols.
+            cols (ndarray): The column indices, broadcast against rows.
+
+        Returns:
+            ndarray: The positions, only meaningful where row != column.
+        """
+        i = np.minimum(rows, cols).astype(np.int64)
+        j = np.maximum(rows, cols).astype(np.int64)
+        return i * (2 * self.n - i - 1) // 2 + j - i - 1
+
+    def build(self, mus: np.ndarray, sigmas: np.ndarray):
+        """
+        Computes every overlap value from the given ratings.
+
+        Args:
+            mus (ndarray): The means of all items.
+            sigmas (ndarray): The standard deviations of all items.
+        """
+        mus = np.asarray(mus, dtype=np.float64)
+        sigmas = np.asarray(sigmas, dtype=np.float64)
+
+        for i in range(self.n - 1):
+            start = self.positions(i, i + 1)
+            self.values[start:start + self.n - i - 1] = intervals_overlap(
+                mus[i], sigmas[i], mus[i + 1:], sigmas[i + 1:])
+
+    def fill(self, value: float):
+        """
+        Sets every overlap value to the same value.
+
+        Args:
+            value (float): The overlap between every pair of items.
+        """
+        self.values.fill(value)
+
+    def rows(self, rows: np.ndarray,
+             cols: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Get a block of the overlap matrix.
+
+        Args:
+            rows (ndarray): The indices of the rows.
+            cols (Optional[ndarray]): The indices of the columns, all columns
+                                      if None.
+
+        Returns:
+            ndarray: A float64 copy of the block.
+        """
+        if cols is None:
+            block = np.empty((len(rows), self.n))
+            for r_i, row in enumerate(np.asarray(rows).tolist()):
+                # the columns to the right are stored contiguously
+                start = self.positions(row, row + 1)
+                block[r_i, row + 1:] = self.values[
+                    start:start + self.n - row - 1]
+                block[r_i, :row] = self.values[
+                    self.positions(np.arange(row), row)]
+                block[r_i, row] = -np.inf
+            return block
+
+        rows = np.asarray(rows, dtype=np.intp)[:, None]
+        cols = np.asarray(cols)
+
+        diagonal = rows == cols[None, :]
+        positions = self.positions(rows, cols[None, :])
+        positions[diagonal] = 0
+
+        block = self.values[positions].astype(np.float64)
+        block[diagonal] = -np.inf
+        return block
+
+    def set_rows(self, rows: np.ndarray, block: np.ndarray):
+        """
+        Overwrites complete rows, and thereby the matching columns, of the
+        overlap matrix.
+
+        Args:
+            rows (ndarray): The indices of the rows.
+            block (ndarray): The new len(rows) x n values.
+        """
+        rows = np.asarray(rows, dtype=np.intp)[:, None]
+        cols = np.arange(self.n)[None, :]
+
+        off_diagonal = np.broadcast_to(rows != cols, block.shape)
+        positions = self.positions(rows, cols)
+        self.values[positions[off_diagonal]] = block[off_diagonal]
+
+    def max(self) -> float:
+        """
+        Get the largest overlap value.
+
+        Returns:
+            float: The largest value of the matrix.
+        """
+        if not len(self.values):
+            return -np.inf
+        return float(self.values.max())
+
+
+# The number of written rows a journal keeps, beyond it the oldest half is
+# dropped.
+JOURNAL_LIMIT = 1 << 16
+
+
+class Journal:
+    """
+    The rows written to a shared overlap file, in the order they were written.
+    Only the most recent writes are kept, so readers that have fallen behind
+    them have to recompute every row.
+    """
+
+    def __init__(self, limit: int = JOURNAL_LIMIT):
+        """
+        Initialize the Journal.
+
+        Args:
+            limit (int): The number of rows kept.
+        """
+        self.limit = limit
+        self.rows = []
+        self.start = 0
+
+    def end(self) -> int:
+        """
+        Get the number of rows written so far, kept or not.
+
+        Returns:
+            int: The position after the last written row.
+        """
+        return self.start + len(self.rows)
+
+    def record(self, rows: np.ndarray):
+        """
+        Appends written rows, dropping the oldest half of the kept rows once
+        there are more than the limit.
+
+        Args:
+            rows (ndarray): The indices of the written rows.
+        """
+        self.rows.extend(int(row) for row in np.asarray(rows).ravel())
+        if len(self.rows) > self.limit:
+            dropped = len(self.rows) - self.limit // 2
+            del self.rows[:dropped]
+            self.start += dropped
+
+    def since(self, mark: int) -> Optional[np.ndarray]:
+        """
+        Get the rows written after a position.
+
+        Args:
+            mark (int): The position, a previous value of end.
+
+        Returns:
+            Optional[ndarray]: The indices of the rows, None if some of them
+                               are no longer kept.
+        """
+        if mark < self.start:
+            return None
+        return np.unique(
+            np.array(self.rows[mark - self.start:], dtype=np.intp))
+
+
+class MemmapOverlap(PackedOverlap):
+    """
+    Packed overlap storage backed by a numpy.memmap file, for datasets whose
+    overlap matrix does not fit in memory. Pickling only stores the path to
+    the file.
+
+    Deep copies share the file. Every write is recorded in a journal shared by
+    the copies, so that a copy restored after another one has written to the
+    file (e.g. when undoing an annotation) can find the rows it has to
+    recompute through stale_rows. The journal only keeps the most recent
+    writes, a copy restored after more writes recomputes every row.
+    """
+
+    kind = "memmap"
+
+    def __init__(self, n: int, path: Optional[str] = None):
+        """
+        Initialize the MemmapOverlap, creating its file.
+
+        Args:
+            n (int): The number of items.
+            path (Optional[str]): The path of the file, if None an anonymous
+                                  temporary file is used.
+        """
+        self.n = n
+        self.path = path
+        self.journal = Journal()
+        self.synced = 0
+
+        if path is None:
+            target = tempfile.TemporaryFile()
+        else:
+            target = path
+
+        self._values = np.memmap(
+            target, dtype=np.float32, mode="w+", shape=(self.size(),))
+
+    def size(self) -> int:
+        """
+        Get the number of values in the file.
+
+        Returns:
+            int: The length of the packed upper triangle, at least one.
+        """
+        return max(1, self.n * (self.n - 1) // 2)
+
+    @property
+    def values(self) -> np.memmap:
+        """
+        The packed overlap values, the file is opened on first access.
+
+        Returns:
+            memmap: The memory mapped values.
+        """
+        if self._values is None:
+            self._values = np.memmap(
+                self.resolve_path(), dtype=np.float32, mode="r+",
+                shape=(self.size(),))
+        return self._values
+
+    def resolve_path(self) -> str:
+        """
+        Get the location of the file, looking in the saves directory if it
+        has been moved since it was created.
+
+        Returns:
+            str: The path to the file.
+        """
+        if os.path.isfile(self.path):
+            return self.path
+
+        import utils.saves_handler as saves_handler
+        return saves_handler.get_full_path(
+            "saves/" + os.path.basename(self.path))
+
+    def set_rows(self, rows: np.ndarray, block: np.ndarray):
+        """
+        Overwrites complete rows, and thereby the matching columns, of the
+        overlap matrix.
+
+        Args:
+            rows (ndarray): The indices of the rows.
+            block (ndarray): The new len(rows) x n values.
+        """
+        super().set_rows(rows, block)
+        self.journal.record(rows)
+        self.synced = self.journal.end()
+
+    def update(self, rows: np.ndarray, mus: np.ndarray, sigmas: np.ndarray):
+        """
+        Recomputes the overlap values of items whose ratings have changed, a
+        block of rows at a time.
+
+        Args:
+            rows (ndarray): The sorted indices of the changed items.
+            mus (ndarray): The means of all items.
+            sigmas (ndarray): The standard deviations of all items.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        step = block_rows(self.n)
+        for start in range(0, len(rows), step):
+            super().update(rows[start:start + step], mus, sigmas)
+
+    def stale_rows(self) -> np.ndarray:
+        """
+        Get the rows that were overwritten through another object sharing the
+        same file, and therefore have to be recomputed.
+
+        Returns:
+            ndarray: The indices of the stale rows, every row if the journal
+                     no longer holds all of them.
+        """
+        stale = self.journal.since(self.synced)
+        if stale is None:
+            return np.arange(self.n)
+        return stale
+
+    def __deepcopy__(self, memo: dict) -> 'MemmapOverlap':
+        # copies share the file and the journal, only their mark differs
+        duplicate = MemmapOverlap.__new__(MemmapOverlap)
+        duplicate.__dict__.update(self.__dict__)
+        return duplicate
+
+    def __getstate__(self) -> dict:
+        if self.path is None:
+            # a temporary file can not be referenced, embed the values instead
+            return {"n": self.n, "path": None,
+                    "values": np.array(self.values)}
+
+        self.values.flush()
+        return {"n": self.n, "path": self.path}
+
+    def __setstate__(self, state: dict):
+        self.n = state["n"]
+        self.path = state["path"]
+        self.journal = Journal()
+        self.synced = 0
+        self._values = None
+
+        if self.path is None:
+            self._values = np.memmap(
+                tempfile.TemporaryFile(), dtype=np.float32, mode="w+",
+                shape=(self.size(),))
+            self._values[:] = state["values"]
+
+
+# The default number of neighbours in mu scored for each item.
+DEFAULT_WINDOW = 16
+
+
+class WindowOverlap(OverlapStorage):
+    """
+    Approximates the overlap matrix by the overlaps of each item with its
+    closest neighbours in mu. The items are kept sorted by mu and the item at
+    every rank stores its overlaps with the next window ranks, so memory and
+    selection scale with n * window instead of n². Pairs further apart than
+    the window are treated as not overlapping.
+    """
+
+    kind = "window"
+
+    def __init__(self, n: int, window: int = DEFAULT_WINDOW):
+        """
+        Initialize the WindowOverlap.
+
+        Args:
+            n (int): The number of items.
+            window (int): The number of following ranks scored for each rank.
+        """
+        self.n = n
+        self.window = window
+        self.order = np.arange(n)
+        self.ranks = np.arange(n)
+        self.band = np.full((n, window), -np.inf)
+        self.row_max = np.full(n, -np.inf)
+
+    def in_range(self) -> np.ndarray:
+        """
+        Get which elements of the band refer to an existing rank.
+
+        Returns:
+            ndarray: An n x window boolean mask.
+        """
+        return (np.arange(self.n)[:, None] +
+                np.arange(1, self.window + 1)) < self.n
+
+    def build(self, mus: np.ndarray, sigmas: np.ndarray):
+        """
+        Sorts the items by mu and computes the overlap of every neighbour.
+
+        Args:
+            mus (ndarray): The means of all items.
+            sigmas (ndarray): The standard deviations of all items.
+        """
+        self.order = np.argsort(mus, kind="stable")
+        self.ranks = np.empty(self.n, dtype=np.intp)
+        self.ranks[self.order] = np.arange(self.n)
+        self.set_band(np.arange(self.n), mus, sigmas)
+
+    def fill(self, value: float):
+        """
+        Sets the overlap of every pair of neighbours to the same value.
+
+        Args:
+            value (float): The overlap value.
+        """
+        self.band = np.where(self.in_range(), value, -np.inf)
+        self.row_max = self.band.max(axis=1, initial=-np.inf)
+
+    def set_band(
+            self, positions: np.ndarray, mus: np.ndarray, sigmas: np.ndarray):
+        """
+        Recomputes the band at the given ranks.
+
+        Args:
+            positions (ndarray): The ranks to recompute.
+            mus (ndarray): The means of all items.
+            sigmas (ndarray): The standard deviations of all items.
+        """
+        neighbours = positions[:, None] + np.arange(1, self.window + 1)
+        items = self.order[positions, None]
+        others = self.order[np.minimum(neighbours, self.n - 1)]
+
+        values = intervals_overlap(
+            mus[items], sigmas[items], mus[others], sigmas[others])
+        values[neighbours >= self.n] = -np.inf
+        self.band[positions] = values
+        self.row_max[positions] = values.max(axis=1, initial=-np.inf)
+
+    def update(self, rows: np.ndarray, mus: np.ndarray, sigmas: np.ndarray):
+        """
+        Moves the items whose ratings have changed to their new rank and
+        recomputes the band around every rank whose item changed.
+
+        Args:
+            rows (ndarray): The sorted indices of the changed items.
+            mus (ndarray): The means of all items.
+            sigmas (ndarray): The standard deviations of all items.
+        """
+        # the order is nearly sorted, which the stable sort handles quickly
+        order = self.order[np.argsort(mus[self.order], kind="stable")]
+        moved = np.flatnonzero(order != self.order)
+
+        self.order = order
+        self.ranks[order] = np.arange(self.n)
+
+        changed = np.union1d(moved, self.ranks[rows])
+        positions = np.unique(np.clip(
+            changed[:, None] - np.arange(self.window + 1), 0, self.n - 1))
+        self.set_band(positions, mus, sigmas)
+
+    def masked_band(self, compared: ComparedPairs) -> np.ndarray:
+        """
+        Get a copy of the band where the pairs already compared are zero.
+
+        Args:
+            compared (ComparedPairs): The pairs compared by a user.
+
+        Returns:
+            ndarray: The masked n x window band.
+        """
+        band = self.band.copy()
+
+        pair_ids = compared.pair_ids()
+        ranks_1 = self.ranks[pair_ids >> 32]
+        ranks_2 = self.ranks[pair_ids & 0xFFFFFFFF]
+
+        distance = np.abs(ranks_1 - ranks_2)
+        near = distance <= self.window
+        band[np.minimum(ranks_1, ranks_2)[near], distance[near] - 1] = 0
+        return band
+
+    def neighbours(
+            self, band: np.ndarray, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the neighbours on both sides of an item and their overlaps.
+
+        Args:
+            band (ndarray): The band to read the overlaps from.
+            i (int): The index of the item.
+
+        Returns:
+            Tuple[ndarray, ndarray]: The indices of the neighbours ordered by
+                                     rank and their overlaps with the item.
+        """
+        rank = self.ranks[i]
+        distance = np.arange(1, self.window + 1)
+
+        before = rank - distance[::-1]
+        before_in_range = before >= 0
+        before = before[before_in_range]
+        after = rank + distance
+        after_in_range = after < self.n
+
+        items = np.concatenate(
+            (self.order[before], self.order[after[after_in_range]]))
+        values = np.concatenate((
+            band[before, distance[::-1][before_in_range] - 1],
+            band[rank, after_in_range]))
+        return items, values
+
+    def pair(self, rank: int, offset: int) -> Tuple[int, int]:
+        """
+        Get the items of an element of the band.
+
+        Args:
+            rank (int): The rank of the first item.
+            offset (int): The column of the band.
+
+        Returns:
+            Tuple[int, int]: The indices of the two items.
+        """
+        return int(self.order[rank]), int(self.order[rank + offset + 1])
+
+    def max(self) -> float:
+        """
+        Get the largest overlap value between neighbours, from the maxima
+        kept for every rank.
+
+        Returns:
+            float: The largest value of the band.
+        """
+        return float(self.row_max.max(initial=-np.inf))
+
+
+class BucketedOverlap(OverlapStorage):
+    """
+    Stores only the overlaps between items of the same or of adjacent buckets,
+    e.g. the ratings given to the items before they are ranked. Every bucket
+    keeps a float32 block of the overlaps of its items with its own items
+    followed by the items of the next bucket, so memory and recomputation
+    scale with the sizes of neighbouring buckets instead of n². Pairs of
+    buckets further apart are treated as not overlapping.
+    """
+
+    kind = "bucketed"
+
+    def __init__(self, n: int, buckets: Optional[np.ndarray] = None):
+        """
+        Initialize the BucketedOverlap.
+
+        Args:
+            n (int): The number of items.
+            buckets (Optional[ndarray]): The bucket label of every item, on a
+                                         scale with a step of one such as the
+                                         ratings. Buckets whose labels differ
+                                         by one are adjacent. A single bucket
+                                         if None.
+        """
+        self.n = n
+        if buckets is None:
+            buckets = np.zeros(n)
+
+        labels, bucket_of = np.unique(
+            np.asarray(buckets), return_inverse=True)
+        self.bucket_of = bucket_of.reshape(-1)
+        self.members = [np.flatnonzero(self.bucket_of == b)
+                        for b in range(len(labels))]
+        # a label without items separates the buckets around it
+        self.adjacent = np.diff(labels) <= 1
+
+        self.positions = np.empty(n, dtype=np.intp)
+        for members in self.members:
+            self.positions[members] = np.arange(len(members))
+
+        self.blocks = [
+            np.empty((len(self.members[b]), len(self.block_columns(b))),
+                     dtype=np.float32) for b in range(len(self.members))]
+
+    def has_next(self, b: int) -> bool:
+        """
+        Check if a bucket is adjacent to the next one.
+
+        Args:
+            b (int): The index of the bucket.
+
+        Returns:
+            bool: True if the next bucket exists and is adjacent.
+        """
+        if not 0 <= b < len(self.members) - 1:
+            return False
+        # storages from older saves treat consecutive labels as adjacent
+        adjacent = getattr(self, 'adjacent', None)
+        return adjacent is None or bool(adjacent[b])
+
+    def block_columns(self, b: int) -> np.ndarray:
+        """
+        Get the items of the columns of the block of a bucket.
+
+        Args:
+            b (int): The index of the bucket.
+
+        Returns:
+            ndarray: The items of the bucket followed by those of the next
+                     bucket if it is adjacent.
+        """
+        if self.has_next(b):
+            return np.concatenate((self.members[b], self.members[b + 1]))
+        return self.members[b]
+
+    def candidates(self, b: int) -> np.ndarray:
+        """
+        Get the items whose overlaps with the items of a bucket are stored.
+
+        Args:
+            b (int): The index of the bucket.
+
+        Returns:
+            ndarray: The items of the adjacent previous bucket, of the same
+                     bucket and of the adjacent next bucket.
+        """
+        if self.has_next(b - 1):
+            return np.concatenate((self.members[b - 1], self.block_columns(b)))
+        return self.block_columns(b)
+
+    def band(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the items ordered by bucket, in which the candidates of every
+        item form a contiguous range.
+
+        Returns:
+            Tuple[ndarray, ndarray, ndarray]: The items in order, and for every
+                                              position the start and the end
+                                              of the positions of its
+                                              candidates.
+        """
+        sizes = [len(members) for members in self.members]
+        offsets = np.cumsum([0] + sizes)
+
+        start = np.repeat([
+            offsets[b - 1] if self.has_next(b - 1) else offsets[b]
+            for b in range(len(sizes))], sizes).astype(np.intp)
+        end = np.repeat([
+            offsets[b + 2] if self.has_next(b) else offsets[b + 1]
+            for b in range(len(sizes))], sizes).astype(np.intp)
+
+        order = np.concatenate(
+            self.members) if self.members else np.empty(0, dtype=np.intp)
+        return order, start, end
+
+    def groups(self, rows: np.ndarray):
+        """
+        Splits rows by their bucket.
+
+        Args:
+            rows (ndarray): The indices of the rows.
+
+        Yields:
+            The index of every bucket among the rows, the positions of its
+            rows in the given rows and their positions within the bucket.
+        """
+        buckets = self.bucket_of[rows]
+        for b in np.unique(buckets).tolist():
+            r_i = np.flatnonzero(buckets == b)
+            yield b, r_i, self.positions[rows[r_i]]
+
+    def set_candidates(
+            self, b: int, positions: np.ndarray, values: np.ndarray):
+        """
+        Overwrites the stored overlaps of items of a bucket, in their rows of
+        the block of the bucket and in their columns of the blocks of the
+        same and of the adjacent previous bucket.
+
+        Args:
+            b (int): The index of the bucket.
+            positions (ndarray): The positions of the items in the bucket.
+            values (ndarray): The overlaps with the candidates of the bucket.
+        """
+        start = len(self.members[b - 1]) if self.has_next(b - 1) else 0
+        end = start + len(self.members[b])
+
+        self.blocks[b][positions] = values[:, start:]
+        self.blocks[b][:, positions] = values[:, start:end].T
+        if start:
+            self.blocks[b - 1][:, start + positions] = values[:, :start].T
+
+    def build(self, mus: np.ndarray, sigmas: np.ndarray):
+        """
+        Computes the overlap of every stored pair from the given ratings.
+
+        Args:
+            mus (ndarray): The means of all items.
+            sigmas (ndarray): The standard deviations of all items.
+        """
+        mus = np.asarray(mus, dtype=np.float64)
+        sigmas = np.asarray(sigmas, dtype=np.float64)
+
+        for b, members in enumerate(self.members):
+            cols = self.block_columns(b)
+            step = block_rows(len(cols))
+            for start in range(0, len(members), step):
+                rows = members[start:start + step]
+                self.blocks[b][start:start + len(rows)] = intervals_overlap(
+                    mus[rows, None], sigmas[rows, None],
+                    mus[None, cols], sigmas[None, cols])
+
+            diagonal = np.arange(len(members))
+            self.blocks[b][diagonal, diagonal] = -np.inf
+
+    def fill(self, value: float):
+        """
+        Sets the overlap of every stored pair to the same value.
+
+        Args:
+            value (float): The overlap value.
+        """
+        for block in self.blocks:
+            block.fill(value)
+            diagonal = np.arange(len(block))
+            block[diagonal, diagonal] = -np.inf
+
+    def rows(self, rows: np.ndarray,
+             cols: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Get a block of the overlap matrix.
+
+        Args:
+            rows (ndarray): The indices of the rows.
+            cols (Optional[ndarray]): The indices of the columns, all columns
+                                      if None.
+
+        Returns:
+            ndarray: A float64 copy of the block, -inf for pairs that are not
+                     stored.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+
+        if cols is None:
+            block = np.full((len(rows), self.n), -np.inf)
+            for b, r_i, positions in self.groups(rows):
+                values = self.blocks[b][positions]
+                if self.has_next(b - 1):
+                    start = len(self.members[b - 1])
+                    values = np.concatenate(
+                        (self.blocks[b - 1][:, start + positions].T, values),
+                        axis=1)
+                block[np.ix_(r_i, self.candidates(b))] = values
+            return block
+
+        cols = np.asarray(cols, dtype=np.intp)
+        col_buckets = self.bucket_of[cols]
+        block = np.full((len(rows), len(cols)), -np.inf)
+
+        for b, r_i, positions in self.groups(rows):
+            # the columns of the own and the adjacent next bucket are in
+            # block b
+            c_i = np.flatnonzero((col_buckets == b) | (
+                (col_buckets == b + 1) & self.has_next(b)))
+            offsets = self.positions[cols[c_i]] + np.where(
+                col_buckets[c_i] == b, 0, len(self.members[b]))
+            block[np.ix_(r_i, c_i)] = self.blocks[b][
+                np.ix_(positions, offsets)]
+
+            if self.has_next(b - 1):
+                c_i = np.flatnonzero(col_buckets == b - 1)
+                start = len(self.members[b - 1])
+                block[np.ix_(r_i, c_i)] = self.blocks[b - 1][np.ix_(
+                    self.positions[cols[c_i]], start + positions)].T
+
+        return block
+
+    def set_rows(self, rows: np.ndarray, block: np.ndarray):
+        """
+        Overwrites complete rows, and thereby the matching columns, of the
+        overlap matrix. Values of pairs that are not stored are ignored.
+
+        Args:
+            rows (ndarray): The indices of the rows.
+            block (ndarray): The new len(rows) x n values.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        for b, r_i, positions in self.groups(rows):
+            self.set_candidates(
+                b, positions, block[np.ix_(r_i, self.candidates(b))])
+
+    def update(self, rows: np.ndarray, mus: np.ndarray, sigmas: np.ndarray):
+        """
+        Recomputes the overlap values of items whose ratings have changed,
+        only against the items of their own and their adjacent buckets.
+
+        Args:
+            rows (ndarray): The sorted indices of the changed items.
+            mus (ndarray): The means of all items.
+            sigmas (ndarray): The standard deviations of all items.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        for b, r_i, positions in self.groups(rows):
+            items = rows[r_i]
+            cols = self.candidates(b)
+
+            values = intervals_overlap(
+                mus[items, None], sigmas[items, None],
+                mus[None, cols], sigmas[None, cols])
+            values[items[:, None] == cols[None, :]] = -np.inf
+            self.set_candidates(b, positions, values)
+
+    def max(self) -> float:
+        """
+        Get the largest stored overlap value.
+
+        Returns:
+            float: The largest value of the blocks.
+        """
+        return float(max(
+            (block.max(initial=-np.inf) for block in self.blocks),
+            default=-np.inf))
+
+
+def bucketed_elements(buckets: np.ndarray) -> int:
+    """
+    Get the number of values stored by a BucketedOverlap.
+
+    Args:
+        buckets (ndarray): The bucket label of every item.
+
+    Returns:
+        int: The number of float32 values of all blocks.
+    """
+    labels, sizes = np.unique(np.asarray(buckets), return_counts=True)
+    following = np.where(np.diff(labels) <= 1, sizes[1:], 0)
+    return int(np.sum(sizes * (sizes + np.append(following, 0))))
+
+
+STORAGES = {storage.kind: storage for storage in (
+    DenseOverlap, PackedOverlap, MemmapOverlap, WindowOverlap,
+    BucketedOverlap)}
+
+# Datasets of at least this many items use packed storage by default.
+PACKED_THRESHOLD = 5000
+
+# Datasets of at least this many items use memory mapped storage by default.
+MEMMAP_THRESHOLD = 40000
+
+
+def default_storage(n: int) -> str:
+    """
+    Get the kind of overlap storage suitable for a dataset of a given size.
+
+    Args:
+        n (int): The number of items.
+
+    Returns:
+        str: The kind of storage, a key of STORAGES.
+    """
+    if n >= MEMMAP_THRESHOLD:
+        return MemmapOverlap.kind
+    if n >= PACKED_THRESHOLD:
+        return PackedOverlap.kind
+    return DenseOverlap.kind
+
+
+def partitioned_storage(buckets: np.ndarray) -> str:
+    """
+    Get the kind of overlap storage suitable for a dataset whose items are
+    partitioned into buckets. Small datasets keep the full matrix, as pairs
+    of distant buckets still correct items drifting out of their bucket.
+    Larger datasets use bucketed storage as long as its blocks are smaller
+    than the packed storage from which on a file is used.
+
+    Args:
+        buckets (ndarray): The bucket label of every item.
+
+    Returns:
+        str: The kind of storage, a key of STORAGES.
+    """
+    kind = default_storage(len(buckets))
+    if kind != DenseOverlap.kind and bucketed_elements(buckets) < \
+            MEMMAP_THRESHOLD * (MEMMAP_THRESHOLD - 1) // 2:
+        return BucketedOverlap.kind
+    return kind
+
+
+def create_storage(
+        kind: str, n: int, path: Optional[str] = None,
+        window: int = DEFAULT_WINDOW, buckets: Optional[np.ndarray] = None):
+    """
+    Creates an empty overlap storage.
+
+    Args:
+        kind (str): The kind of storage, a key of STORAGES.
+        n (int): The number of items.
+        path (Optional[str]): The file backing a memory mapped storage.
+        window (int): The number of neighbours scored by a window storage.
+        buckets (Optional[ndarray]): The bucket label of every item of a
+                                     bucketed storage.
+
+    Returns:
+        The overlap storage.
+    """
+    if kind not in STORAGES:
+        raise ValueError("Unknown overlap storage: " + str(kind))
+    if kind == MemmapOverlap.kind:
+        return MemmapOverlap(n, path)
+    if kind == WindowOverlap.kind:
+        return WindowOverlap(n, window)
+    if kind == BucketedOverlap.kind:
+        return BucketedOverlap(n, buckets)
+    return STORAGES[kind](n)
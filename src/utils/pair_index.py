@@ -0,0 +1,472 @@
+from typing import Callable, Iterable, Optional, Tuple
+
+import numpy as np
+
+# A function returning the values of the given rows, restricted to the given
+# columns if any are passed. It is expected to describe a symmetric matrix.
+RowsFunction = Callable[[np.ndarray, Optional[np.ndarray]], np.ndarray]
+
+
+class BestPairIndex:
+    """
+    Maintains the position of the largest value of a symmetric n x n matrix.
+
+    Every row is split into blocks of columns. The index keeps the maximum of
+    each block as well as the block holding the maximum of each row, so when a
+    few rows (and thereby columns) of the matrix change only the affected
+    blocks have to be recomputed. Ties are resolved towards the smallest row
+    and column, which matches a row by row scan with np.argmax.
+    """
+
+    def __init__(self, n: int, block_size: Optional[int] = None):
+        """
+        Initialize the BestPairIndex.
+
+        Args:
+            n (int): The number of rows and columns of the matrix.
+            block_size (Optional[int]): The number of columns per block,
+                                        defaults to roughly the square root
+                                        of n.
+        """
+        self.n = n
+        self.block_size = block_size or max(16, int(np.sqrt(n)))
+        self.n_blocks = -(-n // self.block_size)
+
+        self.block_max = None
+        self.block_arg = None
+        self.row_max = None
+        self.row_block = None
+        self.changed = set()
+        self.best = None
+
+    def invalidate(self, rows: Iterable[int]):
+        """
+        Marks rows (and thereby columns) whose values have changed.
+
+        Args:
+            rows (Iterable[int]): The indices of the changed rows.
+        """
+        self.changed.update(int(row) for row in rows)
+        self.best = None
+
+    def best_pair(self, rows_fn: RowsFunction) -> Tuple[int, int, float]:
+        """
+        Get the position and value of the largest element of the matrix.
+
+        Args:
+            rows_fn (RowsFunction): Function returning the values of the
+                                    matrix.
+
+        Returns:
+            Tuple[int, int, float]: The row, the column and the value of the
+                                    first largest element.
+        """
+        self.refresh(rows_fn)
+
+        if getattr(self, 'best', None) is None:
+            i = int(np.argmax(self.row_max))
+            self.best = (
+                i, int(self.block_arg[i, self.row_block[i]]), self.row_max[i])
+        return self.best
+
+    def best_in_row(
+            self, i: int, rows_fn: RowsFunction) -> Tuple[int, float]:
+        """
+        Get the position and value of the largest element of a row.
+
+        Args:
+            i (int): The index of the row.
+            rows_fn (RowsFunction): Function returning the values of the
+                                    matrix.
+
+        Returns:
+            Tuple[int, float]: The column and the value of the first largest
+                               element of the row.
+        """
+        self.refresh(rows_fn)
+        return int(self.block_arg[i, self.row_block[i]]), self.row_max[i]
+
+    def refresh(self, rows_fn: RowsFunction):
+        """
+        Brings the index up to date with the matrix by recomputing the blocks
+        that contain changed values.
+
+        Args:
+            rows_fn (RowsFunction): Function returning the values of the
+                                    matrix.
+        """
+        if self.block_max is None:
+            self.build(rows_fn)
+        elif self.changed:
+            changed = np.array(sorted(self.changed), dtype=np.intp)
+            self.changed = set()
+            self.update(changed, rows_fn(changed, None), rows_fn)
+
+    def build(self, rows_fn: RowsFunction):
+        """
+        Computes the index from scratch, a block of rows at a time.
+
+        Args:
+            rows_fn (RowsFunction): Function returning the values of the
+                                    matrix.
+        """
+        self.block_max = np.empty((self.n, self.n_blocks))
+        self.block_arg = np.empty((self.n, self.n_blocks), dtype=np.intp)
+
+        step = max(1, 2 ** 20 // max(self.n, 1))
+        for start in range(0, self.n, step):
+            rows = np.arange(start, min(start + step, self.n))
+            self.set_rows(rows, rows_fn(rows, None))
+
+        self.row_block = np.argmax(self.block_max, axis=1)
+        self.row_max = self.block_max[np.arange(self.n), self.row_block]
+        self.changed = set()
+
+    def set_rows(self, rows: np.ndarray, values: np.ndarray):
+        """
+        Recomputes the block maxima of complete rows.
+
+        Args:
+            rows (ndarray): The indices of the rows.
+            values (ndarray): The values of the rows.
+        """
+        padded = np.full((len(rows), self.n_blocks * self.block_size), -np.inf)
+        padded[:, :self.n] = values
+        padded = padded.reshape(len(rows), self.n_blocks, self.block_size)
+
+        arg = np.argmax(padded, axis=2)
+        self.block_arg[rows] = arg + \
+            np.arange(self.n_blocks) * self.block_size
+        self.block_max[rows] = np.take_along_axis(
+            padded, arg[:, :, None], axis=2)[:, :, 0]
+
+    def update(
+            self, changed: np.ndarray, values: np.ndarray,
+            rows_fn: RowsFunction):
+        """
+        Updates the index after the given rows and columns have changed.
+
+        Args:
+            changed (ndarray): The sorted indices of the changed rows.
+            values (ndarray): The new values of the changed rows.
+            rows_fn (RowsFunction): Function returning the values of the
+                                    matrix.
+        """
+        size = self.block_size
+
+        # the changed rows are the changed columns of every other row
+        for k_i, k in enumerate(changed):
+            c = k // size
+            column = values[k_i]
+            block_max = self.block_max[:, c]
+            block_arg = self.block_arg[:, c]
+
+            decreased = (block_arg == k) & (column < block_max)
+            increased = ~decreased & (
+                (column > block_max) | ((column == block_max) &
+                                        (k < block_arg)))
+            block_max[increased] = column[increased]
+            block_arg[increased] = k
+
+            stale = np.flatnonzero(decreased)
+            if len(stale):
+                cols = np.arange(c * size, min((c + 1) * size, self.n))
+                block = rows_fn(stale, cols)
+                arg = np.argmax(block, axis=1)
+                block_max[stale] = block[np.arange(len(stale)), arg]
+                block_arg[stale] = cols[arg]
+
+        self.set_rows(changed, values)
+
+        for c in np.unique(changed // size):
+            block_max = self.block_max[:, c]
+
+            stale = (self.row_block == c) & (block_max < self.row_max)
+            increased = ~stale & (
+                (block_max > self.row_max) | ((block_max == self.row_max) &
+                                              (c < self.row_block)))
+            self.row_max[increased] = block_max[increased]
+            self.row_block[increased] = c
+
+            stale = np.flatnonzero(stale)
+            if len(stale):
+                self.row_block[stale] = np.argmax(
+                    self.block_max[stale], axis=1)
+                self.row_max[stale] = self.block_max[
+                    stale, self.row_block[stale]]
+
+        self.row_block[changed] = np.argmax(self.block_max[changed], axis=1)
+        self.row_max[changed] = self.block_max[changed,
+                                               self.row_block[changed]]
+
+
+class BandedPairIndex(BestPairIndex):
+    """
+    Maintains the position of the largest value of a symmetric n x n matrix
+    that only holds values within a band. Once its rows and columns are put in
+    a given order, the values of every row lie in a range of columns around
+    the row and everything else reads as -inf. The ranges are symmetric, a row
+    lies in the range of every column in its own range.
+
+    Only the blocks of columns within the range of a row are kept, so reading
+    and updating the index scales with the width of the band instead of n.
+    Ties are resolved towards the smallest row and column in the order.
+    """
+
+    def __init__(
+            self, order: np.ndarray, start: np.ndarray, end: np.ndarray,
+            block_size: Optional[int] = None):
+        """
+        Initialize the BandedPairIndex.
+
+        Args:
+            order (ndarray): The rows of the matrix in the order of the band.
+            start (ndarray): The first position in the order of the columns
+                             of the range of each position.
+            end (ndarray): The position after the last column of the range of
+                           each position.
+            block_size (Optional[int]): The number of columns per block,
+                                        defaults to roughly the square root
+                                        of the widest range.
+        """
+        self.order = np.asarray(order, dtype=np.intp)
+        self.start = np.asarray(start, dtype=np.intp)
+        self.end = np.asarray(end, dtype=np.intp)
+
+        n = len(self.order)
+        width = int((self.end - self.start).max(initial=0))
+        super().__init__(n, block_size or max(16, int(np.sqrt(width))))
+
+        self.position = np.empty(n, dtype=np.intp)
+        self.position[self.order] = np.arange(n)
+
+        # the blocks of a row are stored from the block of its first column
+        self.first = self.start // self.block_size
+        self.last = -(-self.end // self.block_size)
+        self.n_blocks = int((self.last - self.first).max(initial=0))
+
+    def invalidate(self, rows: Iterable[int]):
+        """
+        Marks rows (and thereby columns) whose values have changed.
+
+        Args:
+            rows (Iterable[int]): The indices of the changed rows.
+        """
+        super().invalidate(
+            self.position[np.asarray(list(rows), dtype=np.intp)].tolist())
+
+    def best_pair(self, rows_fn: RowsFunction) -> Tuple[int, int, float]:
+        """
+        Get the position and value of the largest element of the matrix.
+
+        Args:
+            rows_fn (RowsFunction): Function returning the values of the
+                                    matrix.
+
+        Returns:
+            Tuple[int, int, float]: The row, the column and the value of the
+                                    first largest element.
+        """
+        self.refresh(rows_fn)
+
+        if self.best is None:
+            p = int(np.argmax(self.row_max))
+            self.best = (
+                int(self.order[p]),
+                int(self.order[self.block_arg[p, self.row_block[p]]]),
+                self.row_max[p])
+        return self.best
+
+    def best_in_row(
+            self, i: int, rows_fn: RowsFunction) -> Tuple[int, float]:
+        """
+        Get the position and value of the largest element of a row.
+
+        Args:
+            i (int): The index of the row.
+            rows_fn (RowsFunction): Function returning the values of the
+                                    matrix.
+
+        Returns:
+            Tuple[int, float]: The column and the value of the first largest
+                               element of the row.
+        """
+        self.refresh(rows_fn)
+        p = self.position[i]
+        return (int(self.order[self.block_arg[p, self.row_block[p]]]),
+                self.row_max[p])
+
+    def ranges(self, positions: np.ndarray):
+        """
+        Splits positions by their range of columns.
+
+        Args:
+            positions (ndarray): The sorted positions of rows in the order.
+
+        Yields:
+            The positions sharing a range, and the start and end of the range.
+        """
+        spans = self.start[positions] * (self.n + 1) + self.end[positions]
+        for span in np.unique(spans).tolist():
+            start, end = divmod(span, self.n + 1)
+            yield positions[spans == span], start, end
+
+    def read(self, rows_fn: RowsFunction, positions: np.ndarray,
+             cols: np.ndarray) -> np.ndarray:
+        """
+        Get values of the matrix by their positions in the order, -inf
+        outside the range of each row.
+
+        Args:
+            rows_fn (RowsFunction): Function returning the values of the
+                                    matrix.
+            positions (ndarray): The positions of the rows.
+            cols (ndarray): The positions of the columns.
+
+        Returns:
+            ndarray: The len(positions) x len(cols) values.
+        """
+        values = rows_fn(self.order[positions], self.order[cols])
+        outside = (cols[None, :] < self.start[positions, None]) | \
+            (cols[None, :] >= self.end[positions, None])
+        values[outside] = -np.inf
+        return values
+
+    def refresh(self, rows_fn: RowsFunction):
+        """
+        Brings the index up to date with the matrix by recomputing the blocks
+        that contain changed values.
+
+        Args:
+            rows_fn (RowsFunction): Function returning the values of the
+                                    matrix.
+        """
+        if self.block_max is None:
+            self.build(rows_fn)
+        elif self.changed:
+            changed = np.array(sorted(self.changed), dtype=np.intp)
+            self.changed = set()
+            for positions, start, end in self.ranges(changed):
+                self.update(positions, self.read(
+                    rows_fn, positions, np.arange(start, end)), rows_fn)
+
+    def build(self, rows_fn: RowsFunction):
+        """
+        Computes the index from scratch, a block of rows at a time.
+
+        Args:
+            rows_fn (RowsFunction): Function returning the values of the
+                                    matrix.
+        """
+        self.block_max = np.full((self.n, self.n_blocks), -np.inf)
+        self.block_arg = np.zeros((self.n, self.n_blocks), dtype=np.intp)
+
+        for positions, start, end in self.ranges(np.arange(self.n)):
+            step = max(1, 2 ** 20 // max(end - start, 1))
+            for i in range(0, len(positions), step):
+                rows = positions[i:i + step]
+                self.set_rows(rows, self.read(
+                    rows_fn, rows, np.arange(start, end)))
+
+        self.row_block = np.argmax(self.block_max, axis=1)
+        self.row_max = self.block_max[np.arange(self.n), self.row_block]
+        self.changed = set()
+
+    def set_rows(self, rows: np.ndarray, values: np.ndarray):
+        """
+        Recomputes the block maxima of complete rows sharing a range.
+
+        Args:
+            rows (ndarray): The positions of the rows.
+            values (ndarray): The values of the rows within their range.
+        """
+        size = self.block_size
+        first = self.first[rows[0]]
+        blocks = self.last[rows[0]] - first
+        offset = self.start[rows[0]] - first * size
+
+        padded = np.full((len(rows), blocks * size), -np.inf)
+        padded[:, offset:offset + values.shape[1]] = values
+        padded = padded.reshape(len(rows), blocks, size)
+
+        arg = np.argmax(padded, axis=2)
+        self.block_arg[rows, :blocks] = arg + \
+            (first + np.arange(blocks)) * size
+        self.block_max[rows, :blocks] = np.take_along_axis(
+            padded, arg[:, :, None], axis=2)[:, :, 0]
+
+    def update(
+            self, changed: np.ndarray, values: np.ndarray,
+            rows_fn: RowsFunction):
+        """
+        Updates the index after the given rows and columns have changed.
+
+        Args:
+            changed (ndarray): The sorted positions of the changed rows, which
+                               share a range.
+            values (ndarray): The new values of the changed rows within their
+                              range.
+            rows_fn (RowsFunction): Function returning the values of the
+                                    matrix.
+        """
+        size = self.block_size
+
+        # the changed rows are the changed columns of the rows in their range
+        rows = np.arange(self.start[changed[0]], self.end[changed[0]])
+        first = self.first[rows]
+
+        for k_i, k in enumerate(changed):
+            j = k // size - first
+            column = values[k_i]
+            block_max = self.block_max[rows, j]
+            block_arg = self.block_arg[rows, j]
+
+            decreased = (block_arg == k) & (column < block_max)
+            increased = ~decreased & (
+                (column > block_max) | ((column == block_max) &
+                                        (k < block_arg)))
+            block_max[increased] = column[increased]
+            block_arg[increased] = k
+
+            stale = np.flatnonzero(decreased)
+            if len(stale):
+                c = k // size
+                cols = np.arange(
+                    max(c * size, self.start[rows[stale]].min()),
+                    min((c + 1) * size, self.end[rows[stale]].max()))
+                block = self.read(rows_fn, rows[stale], cols)
+                arg = np.argmax(block, axis=1)
+                block_max[stale] = block[np.arange(len(stale)), arg]
+                block_arg[stale] = cols[arg]
+
+            self.block_max[rows, j] = block_max
+            self.block_arg[rows, j] = block_arg
+
+        self.set_rows(changed, values)
+
+        for c in np.unique(changed // size):
+            j = c - first
+            block_max = self.block_max[rows, j]
+            row_max = self.row_max[rows]
+            row_block = self.row_block[rows]
+
+            stale = (row_block == j) & (block_max < row_max)
+            increased = ~stale & (
+                (block_max > row_max) | ((block_max == row_max) &
+                                         (j < row_block)))
+            row_max[increased] = block_max[increased]
+            row_block[increased] = j[increased]
+
+            stale = np.flatnonzero(stale)
+            if len(stale):
+                row_block[stale] = np.argmax(
+                    self.block_max[rows[stale]], axis=1)
+                row_max[stale] = self.block_max[
+                    rows[stale], row_block[stale]]
+
+            self.row_max[rows] = row_max
+            self.row_block[rows] = row_block
+
+        self.row_block[changed] = np.argmax(self.block_max[changed], axis=1)
+        self.row_max[changed] = self.block_max[changed,
+                                               self.row_block[changed]]
@@ -0,0 +1,85 @@
+from typing import Iterable
+
+import numpy as np
+
+
+class RankingIndex:
+    """
+    Keeps item indices sorted by increasing mean, where equal means are
+    ordered by index. Moving an item costs a binary search and a shift of the
+    sorted arrays, so the ranking is never sorted again from scratch.
+    """
+
+    def __init__(self, mus: Iterable[float]):
+        """
+        Initialize the RankingIndex.
+
+        Args:
+            mus (Iterable[float]): The mean of every item.
+        """
+        self.mus = np.array(mus, dtype=np.float64)
+        self.order = np.argsort(self.mus, kind="stable")
+        self.sorted_mus = self.mus[self.order]
+
+    def position(self, mu: float, i: int) -> int:
+        """
+        Get the position of an item with a given mean in the sorted arrays.
+
+        Args:
+            mu (float): The mean of the item.
+            i (int): The index of the item.
+
+        Returns:
+            int: The position, where the item is or should be inserted.
+        """
+        low = np.searchsorted(self.sorted_mus, mu, side="left")
+        high = np.searchsorted(self.sorted_mus, mu, side="right")
+        return int(low + np.searchsorted(self.order[low:high], i))
+
+    def update(self, i: int, mu: float):
+        """
+        Moves an item to the rank of its new mean.
+
+        Args:
+            i (int): The index of the item.
+            mu (float): The new mean of the item.
+        """
+        old = self.position(self.mus[i], i)
+        new = self.position(mu, i)
+        self.mus[i] = mu
+
+        # shift the items in between by one place, towards the old position
+        if new > old:
+            new -= 1
+            self.order[old:new] = self.order[old + 1:new + 1]
+            self.sorted_mus[old:new] = self.sorted_mus[old + 1:new + 1]
+        else:
+            self.order[new + 1:old + 1] = self.order[new:old]
+            self.sorted_mus[new + 1:old + 1] = self.sorted_mus[new:old]
+
+        self.order[new] = i
+        self.sorted_mus[new] = mu
+
+    def rank(self, i: int) -> int:
+        """
+        Get the rank of an item.
+
+        Args:
+            i (int): The index of the item.
+
+        Returns:
+            int: The number of items ranked below the item.
+        """
+        return self.position(self.mus[i], i)
+
+    def top(self, k: int) -> np.ndarray:
+        """
+        Get the items with the highest means.
+
+        Args:
+            k (int): The number of items.
+
+        Returns:
+            ndarray: The indices of the k highest ranked items, highest first.
+        """
+        return self.order[::-1][:k]
@@ -0,0 +1,157 @@
+from typing import Iterable, List, Tuple, Union
+
+import numpy as np
+
+from utils.rating_queue import UNRATED
+
+
+class RatingMatrix:
+    """
+    The ratings of all users as a users x items matrix of small integers, in
+    which items a user has not rated hold UNRATED. Every aggregate is computed
+    over the columns of the matrix at once.
+    """
+
+    def __init__(
+            self, users: Iterable[str],
+            keys: Iterable[Union[int, float, str]], values: np.ndarray):
+        """
+        Initialize the RatingMatrix.
+
+        Args:
+            users (Iterable[str]): The IDs of the users, one per row.
+            keys (Iterable): The keys of the items, one per column.
+            values (ndarray): The ratings, UNRATED where there is none.
+        """
+        self.users = list(users)
+        self.keys = list(keys)
+        self.values = np.asarray(values, dtype=np.int16).reshape(
+            len(self.users), len(self.keys))
+
+    @classmethod
+    def from_ratings(
+            cls, keys: Iterable[Union[int, float, str]],
+            ratings: Iterable[Tuple[str, Union[int, float, str], int]]
+    ) -> 'RatingMatrix':
+        """
+        Creates a RatingMatrix from individual ratings, a later rating of the
+        same item by the same user replaces the earlier one.
+
+        Args:
+            keys (Iterable): The keys of the items.
+            ratings (Iterable[Tuple[str, Any, int]]): The user, the key of the
+                                                      item and the rating.
+
+        Returns:
+            RatingMatrix: The matrix holding the ratings.
+        """
+        keys = list(keys)
+        index = {key: i for i, key in enumerate(keys)}
+
+        users = {}
+        entries = {}
+        for user_id, key, label in ratings:
+            row = users.setdefault(user_id, len(users))
+            entries[row, index[key]] = label
+
+        values = np.full((len(users), len(keys)), UNRATED, dtype=np.int16)
+        if entries:
+            rows, cols = zip(*entries)
+            values[rows, cols] = list(entries.values())
+        return cls(users, keys, values)
+
+    def rated(self) -> np.ndarray:
+        """
+        Get which users have rated which items.
+
+        Returns:
+            ndarray: A boolean users x items matrix.
+        """
+        return self.values != UNRATED
+
+    def rating_counts(self) -> np.ndarray:
+        """
+        Get the number of ratings of every item.
+
+        Returns:
+            ndarray: The number of users that have rated each item.
+        """
+        return np.count_nonzero(self.rated(), axis=0)
+
+    def item_means(self) -> np.ndarray:
+        """
+        Get the mean rating of every item.
+
+        Returns:
+            ndarray: The mean of each item, nan for items without ratings.
+        """
+        rated = self.rated()
+        counts = np.count_nonzero(rated, axis=0)
+        sums = np.where(rated, self.values, 0).sum(axis=0)
+
+        means = np.full(len(self.keys), np.nan)
+        np.divide(sums, counts, out=means, where=counts > 0)
+        return means
+
+    def item_medians(self) -> np.ndarray:
+        """
+        Get the median rating of every item.
+
+        Returns:
+            ndarray: The median of each item, nan for items without ratings.
+        """
+        medians = np.full(len(self.keys), np.nan)
+        if not self.users:
+            return medians
+
+        # the unrated entries are sorted to the end of every column
+        counts = self.rating_counts()
+        columns = np.sort(np.where(
+            self.rated(), self.values, np.iinfo(np.int16).max), axis=0)
+
+        has_rating = np.flatnonzero(counts)
+        low = columns[(counts[has_rating] - 1) // 2, has_rating]
+        high = columns[counts[has_rating] // 2, has_rating]
+        medians[has_rating] = (low + high) / 2
+        return medians
+
+    def label_members(self, label: int) -> List[Union[int, float, str]]:
+        """
+        Get the items that were given a label, once per user giving it.
+
+        Args:
+            label (int): The rating.
+
+        Returns:
+            List: The keys of the items, in item order.
+        """
+        counts = np.count_nonzero(self.values == label, axis=0)
+        return [self.keys[i] for i in
+                np.repeat(np.arange(len(self.keys)), counts).tolist()]
+
+    def user_histogram(self, user_id: str, n_labels: int) -> np.ndarray:
+        """
+        Get how often a user has given each label.
+
+        Args:
+            user_id (str): The ID of the user.
+            n_labels (int): The number of labels.
+
+        Returns:
+            ndarray: The number of ratings of the user per label.
+        """
+        row = self.values[self.users.index(user_id)]
+        return np.bincount(row[row != UNRATED], minlength=n_labels)
+
+    def label_counts(self, n_labels: int) -> np.ndarray:
+        """
+        Get how often each label was given by all users together.
+
+        Args:
+            n_labels (int): The number of labels.
+
+        Returns:
+            ndarray: The number of ratings per label.
+        """
+        return np.bincount(
+            self.values[self.rated()], minlength=n_labels)
@@ -0,0 +1,153 @@
+import zlib
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# The value of the items that have not been rated yet.
+UNRATED = -1
+
+
+def user_seed(user_id: str) -> int:
+    """
+    Get the seed of the queue of a user. Unlike the built-in hash, the seed is
+    the same in every session.
+
+    Args:
+        user_id (str): The ID of the user.
+
+    Returns:
+        int: A seed derived from the ID of the user.
+    """
+    return zlib.crc32(str(user_id).encode("utf-8"))
+
+
+class RatingQueue:
+    """
+    The items a user still has to rate, stored as a seeded permutation of the
+    item ids and a cursor into it, together with the rating given to every
+    item. The permutation is regenerated from its seed instead of being
+    saved, so a user costs two bytes per item.
+    """
+
+    def __init__(
+            self, n: int, seed: int = 0,
+            order: Optional[Iterable[int]] = None):
+        """
+        Initialize the RatingQueue.
+
+        Args:
+            n (int): The number of items.
+            seed (int): The seed of the permutation of the items.
+            order (Optional[Iterable[int]]): An explicit order of the item
+                                             ids, which is saved instead of
+                                             the seed.
+        """
+        self.n = n
+        self.seed = seed
+        self.fixed_order = None if order is None else np.array(
+            order, dtype=np.int32)
+        self.cursor = 0
+        self.count = 0
+        self.values = np.full(n, UNRATED, dtype=np.int16)
+        self.order = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # the permutation is regenerated from the seed when needed
+        state["order"] = None
+        return state
+
+    def get_order(self) -> np.ndarray:
+        """
+        Get the order in which the items are rated.
+
+        Returns:
+            ndarray: The permutation of the item ids.
+        """
+        if self.order is None:
+            if self.fixed_order is not None:
+                self.order = self.fixed_order
+            else:
+                self.order = np.random.RandomState(
+                    self.seed).permutation(self.n)
+        return self.order
+
+    def head(self, closed: Optional[np.ndarray] = None) -> Optional[int]:
+        """
+        Get the next item to rate, skipping items rated out of turn.
+
+        Args:
+            closed (Optional[ndarray]): A boolean mask of the items that no
+                                        longer need ratings. Skipped items are
+                                        not revisited, so an item may not be
+                                        reopened once closed.
+
+        Returns:
+            Optional[int]: The id of the item, None if all items are rated.
+        """
+        order = self.get_order()
+        while self.cursor < self.n and (
+                self.values[order[self.cursor]] != UNRATED or
+                (closed is not None and closed[order[self.cursor]])):
+            self.cursor += 1
+
+        if self.cursor < self.n:
+            return int(order[self.cursor])
+        return None
+
+    def least_rated(
+            self, counts: np.ndarray, closed: np.ndarray) -> Optional[int]:
+        """
+        Get the open item with the fewest ratings among the items this user
+        has not rated, so that the items are shared evenly between the users.
+        Ties are broken by the order of the queue.
+
+        Args:
+            counts (ndarray): The number of ratings of every item by all users.
+            closed (ndarray): A boolean mask of the items that no longer need
+                              ratings.
+
+        Returns:
+            Optional[int]: The id of the item, None if no item is left.
+        """
+        order = self.get_order()
+        candidates = (self.values[order] == UNRATED) & ~closed[order]
+        if not candidates.any():
+            return None
+
+        order_counts = counts[order]
+        least = order_counts[candidates].min()
+        return int(order[np.argmax(candidates & (order_counts == least))])
+
+    def rate(self, i: int, value: int) -> bool:
+        """
+        Stores the rating of an item.
+
+        Args:
+            i (int): The id of the item.
+            value (int): The rating, a small non-negative integer.
+
+        Returns:
+            bool: True if the item was not rated before, False otherwise.
+        """
+        if self.values[i] != UNRATED:
+            return False
+
+        self.values[i] = value
+        self.count += 1
+        return True
+
+    def rated(self) -> List[Tuple[int, int]]:
+        """
+        Get the rated items in the order of the queue.
+
+        Returns:
+            List[Tuple[int, int]]: The id and the rating of every rated item.
+        """
+        order = self.get_order()
+        values = self.values[order]
+        is_rated = values != UNRATED
+        return list(zip(order[is_rated].tolist(), values[is_rated].tolist()))
+
+    def __len__(self) -> int:
+        return self.n - self.count
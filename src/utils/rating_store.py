@@ -0,0 +1,166 @@
+from collections.abc import Mapping
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+from trueskill import Rating
+
+
+class RatingStore(Mapping):
+    """
+    Compact storage of TrueSkill ratings. The means and standard deviations are
+    kept in contiguous arrays indexed by item id, while the mapping interface
+    mirrors a dictionary of Rating objects keyed by filename.
+    """
+
+    def __init__(
+            self, keys: Iterable[Union[int, float, str]],
+            mus: Optional[Iterable[float]] = None,
+            sigmas: Optional[Iterable[float]] = None):
+        """
+        Initialize the RatingStore.
+
+        Args:
+            keys: The keys of the rated items, their position is their id. A
+                  list is shared rather than copied, so that rating_arrays
+                  recognises it by identity.
+            mus: The initial means, defaults to the TrueSkill default.
+            sigmas: The initial standard deviations, defaults to the TrueSkill
+                    default.
+        """
+        self.keys_list = keys if isinstance(keys, list) else list(keys)
+        self.index = {k: i for i, k in enumerate(self.keys_list)}
+
+        default = Rating()
+        n = len(self.keys_list)
+
+        if mus is None:
+            self.mus = np.full(n, default.mu)
+        else:
+            self.mus = np.array(mus, dtype=np.float64)
+
+        if sigmas is None:
+            self.sigmas = np.full(n, default.sigma)
+        else:
+            self.sigmas = np.array(sigmas, dtype=np.float64)
+
+    def __getitem__(self, key: Union[int, float, str]) -> Rating:
+        i = self.index[key]
+        return Rating(self.mus[i], self.sigmas[i])
+
+    def __setitem__(self, key: Union[int, float, str], rating: Rating):
+        if key not in self.index:
+            self.append(key, rating)
+            return
+
+        i = self.index[key]
+        self.mus[i] = rating.mu
+        self.sigmas[i] = rating.sigma
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.index
+
+    def __iter__(self) -> Iterator[Union[int, float, str]]:
+        return iter(self.keys_list)
+
+    def __len__(self) -> int:
+        return len(self.keys_list)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # the index is rebuilt when loading in order to keep the pickle small
+        state.pop("index")
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.index = {k: i for i, k in enumerate(self.keys_list)}
+
+    def append(self, key: Union[int, float, str], rating: Rating):
+        """
+        Adds a new item to the store.
+
+        Args:
+            key: The key of the new item.
+            rating: The rating of the new item.
+        """
+        self.index[key] = len(self.keys_list)
+        self.keys_list.append(key)
+        self.mus = np.append(self.mus, rating.mu)
+        self.sigmas = np.append(self.sigmas, rating.sigma)
+
+    def id_of(self, key: Union[int, float, str]) -> int:
+        """
+        Get the item id of a key.
+
+        Args:
+            key: The key of the item.
+
+        Returns:
+            The position of the item in the mu and sigma arrays.
+        """
+        return self.index[key]
+
+    def key_of(self, item_id: int) -> Union[int, float, str]:
+        """
+        Get the key of an item id.
+
+        Args:
+            item_id: The position of the item in the mu and sigma arrays.
+
+        Returns:
+            The key of the item.
+        """
+        return self.keys_list[item_id]
+
+    def sorted_keys(self) -> list:
+        """
+        Get the keys sorted by increasing mu, equal means keep their
+        insertion order.
+
+        Returns:
+            A list of the keys sorted by mu.
+        """
+        return [self.keys_list[i]
+                for i in np.argsort(self.mus, kind="stable")]
+
+
+def rating_arrays(ratings: Mapping, keys: Iterable[Union[int, float, str]]):
+    """
+    Get the means and standard deviations of the given items as arrays.
+
+    Args:
+        ratings: A RatingStore or a dictionary of Rating objects.
+        keys: The keys of the items, in the order they should be returned.
+
+    Returns:
+        A tuple of two arrays containing the means and standard deviations.
+    """
+    if isinstance(ratings, RatingStore) and (
+            keys is ratings.keys_list or list(keys) == ratings.keys_list):
+        return ratings.mus, ratings.sigmas
+
+    keys = list(keys)
+    mus = np.fromiter((ratings[k].mu for k in keys), np.float64, len(keys))
+    sigmas = np.fromiter(
+        (ratings[k].sigma for k in keys), np.float64, len(keys))
+    return mus, sigmas
+
+
+def rmse(prev_ratings: Mapping, ratings: Mapping,
+         keys: Iterable[Union[int, float, str]]) -> float:
+    """
+    Computes the root mean square difference between the means of two sets of
+    ratings.
+
+    Args:
+        prev_ratings: The previous ratings.
+        ratings: The current ratings.
+        keys: The keys of the items to compare.
+
+    Returns:
+        The root mean square difference of the means.
+    """
+    keys = list(keys)
+    prev_mus, _ = rating_arrays(prev_ratings, keys)
+    mus, _ = rating_arrays(ratings, keys)
+    return float(np.sqrt(np.sum((prev_mus - mus) ** 2) / len(keys)))
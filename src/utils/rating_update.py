@@ -0,0 +1,252 @@
+import math
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import trueskill
+
+# Coefficients of the complementary error function approximation used by the
+# trueskill package, applied here to whole arrays.
+ERFC_COEFFICIENTS = (
+    -1.26551223, 1.00002368, 0.37409196, 0.09678418, -0.18628806,
+    0.27886807, -1.13520398, 1.48851587, -0.82215223, 0.17087277)
+
+
+def erfc(x: np.ndarray) -> np.ndarray:
+    """
+    Complementary error function, with the same approximation as trueskill.
+
+    Args:
+        x (ndarray): The arguments.
+
+    Returns:
+        ndarray: The complementary error function of every argument.
+    """
+    z = np.abs(x)
+    t = 1. / (1. + z / 2.)
+
+    polynomial = np.zeros_like(t)
+    for coefficient in ERFC_COEFFICIENTS[:0:-1]:
+        polynomial = t * (coefficient + polynomial)
+
+    r = t * np.exp(-z * z + ERFC_COEFFICIENTS[0] + polynomial)
+    return np.where(x < 0, 2. - r, r)
+
+
+def cdf(x: np.ndarray) -> np.ndarray:
+    """
+    Cumulative distribution function of the standard normal distribution.
+
+    Args:
+        x (ndarray): The arguments.
+
+    Returns:
+        ndarray: The probabilities.
+    """
+    return 0.5 * erfc(-x / math.sqrt(2))
+
+
+def pdf(x: np.ndarray) -> np.ndarray:
+    """
+    Probability density function of the standard normal distribution.
+
+    Args:
+        x (ndarray): The arguments.
+
+    Returns:
+        ndarray: The densities.
+    """
+    return np.exp(-x ** 2 / 2) / math.sqrt(2 * math.pi)
+
+
+def win_factors(
+        diff: np.ndarray,
+        draw_margin: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The "V" and "W" functions of a win, the corrections of the mean and the
+    variance of the performance difference.
+
+    Args:
+        diff (ndarray): The mean differences divided by their deviation.
+        draw_margin (ndarray): The draw margins divided by the deviation.
+
+    Returns:
+        Tuple[ndarray, ndarray]: The additive corrections of the mean and the
+                                 multiplicative corrections of the variance,
+                                 the latter kept within [0, 1) where trueskill
+                                 would raise a FloatingPointError.
+    """
+    x = diff - draw_margin
+    denom = cdf(x)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        v = np.where(denom > 0, pdf(x) / denom, -x)
+
+    w = v * (v + x)
+    return v, np.clip(w, 0, np.nextafter(1, 0))
+
+
+def draw_factors(
+        diff: np.ndarray,
+        draw_margin: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The "V" and "W" functions of a draw, the corrections of the mean and the
+    variance of the performance difference.
+
+    Args:
+        diff (ndarray): The mean differences divided by their deviation.
+        draw_margin (ndarray): The draw margins divided by the deviation.
+
+    Returns:
+        Tuple[ndarray, ndarray]: The additive corrections of the mean and the
+                                 multiplicative corrections of the variance,
+                                 the latter kept within [0, 1) where trueskill
+                                 would raise a FloatingPointError.
+    """
+    abs_diff = np.abs(diff)
+    a, b = draw_margin - abs_diff, -draw_margin - abs_diff
+    denom = cdf(a) - cdf(b)
+    pdf_a, pdf_b = pdf(a), pdf(b)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        v = np.where(denom > 0, (pdf_b - pdf_a) / denom, a)
+        w = v ** 2 + (a * pdf_a - b * pdf_b) / denom
+
+    w = np.clip(np.nan_to_num(w, nan=0.), 0, np.nextafter(1, 0))
+    return np.where(diff < 0, -v, v), w
+
+
+def rate_1vs1(
+        mus_1: np.ndarray, sigmas_1: np.ndarray, mus_2: np.ndarray,
+        sigmas_2: np.ndarray, drawn: np.ndarray,
+        env: Optional[trueskill.TrueSkill] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Applies independent two player updates at once, using the closed form of
+    the factor graph built by trueskill.rate_1vs1.
+
+    Args:
+        mus_1 (ndarray): The means of the winners.
+        sigmas_1 (ndarray): The standard deviations of the winners.
+        mus_2 (ndarray): The means of the losers.
+        sigmas_2 (ndarray): The standard deviations of the losers.
+        drawn (ndarray): Whether each match was a draw.
+        env (Optional[TrueSkill]): The trueskill environment, defaults to the
+                                   global environment.
+
+    Returns:
+        The new means and standard deviations of the winners and losers.
+    """
+    if env is None:
+        env = trueskill.global_env()
+
+    variances_1 = np.square(sigmas_1) + env.tau ** 2
+    variances_2 = np.square(sigmas_2) + env.tau ** 2
+
+    c = np.sqrt(2 * env.beta ** 2 + variances_1 + variances_2)
+    diff = (np.asarray(mus_1) - mus_2) / c
+    draw_margin = trueskill.calc_draw_margin(env.draw_probability, 2, env) / c
+
+    drawn = np.asarray(drawn, dtype=bool)
+    v = np.empty_like(diff)
+    w = np.empty_like(diff)
+
+    if not drawn.all():
+        won = ~drawn
+        v[won], w[won] = win_factors(diff[won], draw_margin[won])
+    if drawn.any():
+        v[drawn], w[drawn] = draw_factors(diff[drawn], draw_margin[drawn])
+
+    new_mus_1 = mus_1 + variances_1 / c * v
+    new_mus_2 = mus_2 - variances_2 / c * v
+    new_sigmas_1 = np.sqrt(variances_1 * (1 - variances_1 / c ** 2 * w))
+    new_sigmas_2 = np.sqrt(variances_2 * (1 - variances_2 / c ** 2 * w))
+
+    return new_mus_1, new_sigmas_1, new_mus_2, new_sigmas_2
+
+
+def expected_entropy_reduction(
+        mus_1: np.ndarray, sigmas_1: np.ndarray, mus_2: np.ndarray,
+        sigmas_2: np.ndarray, env: Optional[trueskill.TrueSkill] = None
+) -> np.ndarray:
+    """
+    The expected information gain of two player matches, i.e. the expected
+    decrease of the entropy of the Gaussian ratings of both players. Every
+    outcome, a win of either player or a draw, is weighted by its predicted
+    probability and shrinks the variances as rate_1vs1 would.
+
+    Args:
+        mus_1 (ndarray): The means of the first players.
+        sigmas_1 (ndarray): The standard deviations of the first players.
+        mus_2 (ndarray): The means of the second players.
+        sigmas_2 (ndarray): The standard deviations of the second players.
+        env (Optional[TrueSkill]): The trueskill environment, defaults to the
+                                   global environment.
+
+    Returns:
+        ndarray: The expected entropy decrease of every match in nats.
+    """
+    if env is None:
+        env = trueskill.global_env()
+
+    variances_1 = np.square(sigmas_1) + env.tau ** 2
+    variances_2 = np.square(sigmas_2) + env.tau ** 2
+
+    c = np.sqrt(2 * env.beta ** 2 + variances_1 + variances_2)
+    diff = np.abs(np.asarray(mus_1) - mus_2) / c
+    draw_margin = trueskill.calc_draw_margin(
+        env.draw_probability, 2, env) / c
+
+    # the variances shrink the same whichever player wins, so only the
+    # favourite winning, the underdog winning and a draw are told apart, all
+    # from the same two evaluations of the cdf and the pdf
+    x_favourite = diff - draw_margin
+    x_underdog = -diff - draw_margin
+    p_favourite = cdf(x_favourite)
+    p_underdog = cdf(x_underdog)
+    p_drawn = np.clip(1 - p_favourite - p_underdog, 0, 1)
+    pdf_favourite = pdf(x_favourite)
+    pdf_underdog = pdf(x_underdog)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        v = pdf_favourite / p_favourite
+        w_favourite = v * (v + x_favourite)
+        v = pdf_underdog / p_underdog
+        w_underdog = v * (v + x_underdog)
+        # the draw factors with a = -x_favourite and b = x_underdog
+        v = (pdf_underdog - pdf_favourite) / p_drawn
+        w_drawn = v ** 2 + (-x_favourite * pdf_favourite -
+                            x_underdog * pdf_underdog) / p_drawn
+
+    gain = np.zeros_like(diff)
+    for p, w in ((p_favourite, w_favourite), (p_underdog, w_underdog),
+                 (p_drawn, w_drawn)):
+        w = np.clip(np.nan_to_num(w, nan=0.), 0, np.nextafter(1, 0))
+        gain -= p * 0.5 * (np.log1p(-variances_1 / c ** 2 * w) +
+                           np.log1p(-variances_2 / c ** 2 * w))
+
+    return gain
+
+
+def independent_layers(pairs: Iterable[Tuple[int, int]]) -> List[List[int]]:
+    """
+    Groups a sequence of pairwise updates into layers of updates that share no
+    item. Every update is placed after the last earlier update of its items,
+    so applying the layers in order gives the same result as applying the
+    updates one by one.
+
+    Args:
+        pairs (Iterable[Tuple[int, int]]): The items of each update.
+
+    Returns:
+        List[List[int]]: The positions of the updates in every layer.
+    """
+    layers = []
+    next_layer = {}
+
+    for position, (i, j) in enumerate(pairs):
+        layer = max(next_layer.get(i, 0), next_layer.get(j, 0))
+        if layer == len(layers):
+            layers.append([])
+        layers[layer].append(position)
+        next_layer[i] = next_layer[j] = layer + 1
+
+    return layers
@@ -1,10 +1,10 @@
 import copy
-import math
 from typing import List, Tuple
 
 import pandas as pd
 
 import sorting_algorithms as sa
+import utils.rating_store as rating_store
 import utils.saves_handler as saves_handler
 
 
@@ -25,7 +25,11 @@ def recompute_trueskill(save: dict) -> Tuple[sa.TrueSkill, List[float]]:
     sort_alg = sa.TrueSkill(
         data=save['sort_alg'].data,
         comparison_size=save['sort_alg'].comparison_size,
-        comparison_max=save['sort_alg'].comparison_max)
+        comparison_max=save['sort_alg'].comparison_max,
+        compact_ratings=isinstance(
+            save['sort_alg'].ratings, rating_store.RatingStore),
+        overlap_storage=save['sort_alg'].overlap.kind,
+        update_mode=getattr(save['sort_alg'], 'update_mode', "pairwise"))
     rmses = []
     prev_ratings = copy.deepcopy(sort_alg.ratings)
 
@@ -46,10 +50,8 @@ def recompute_trueskill(save: dict) -> Tuple[sa.TrueSkill, List[float]]:
             sort_alg.inference(i_df['user'], res, diff_lvls)
 
             if i > 0:
-                rmse = math.sqrt(
-                    sum(
-                        (prev_ratings[key].mu - sort_alg.ratings[key].mu) ** 2
-                        for key in sort_alg.data) / sort_alg.n)
+                rmse = rating_store.rmse(
+                    prev_ratings, sort_alg.ratings, sort_alg.data)
                 rmses.append(rmse)
 
             prev_ratings = copy.deepcopy(sort_alg.ratings)
@@ -71,7 +73,8 @@ def recompute_ratings(save: dict) -> sa.RatingAlgorithm:
     csv = pd.read_csv(saves_handler.get_path_to_save(save) + '.csv')
     csv = csv[csv['type'] == 'Rating']
     sort_alg = sa.RatingAlgorithm(
-        data=save['sort_alg'].data)
+        data=save['sort_alg'].data,
+        ratings_per_item=getattr(save['sort_alg'], 'ratings_per_item', None))
 
     for _, i_df in csv.iterrows():
 
@@ -106,7 +109,9 @@ def recompute_hybridtrueskill(save: dict) -> Tuple[sa.HybridTrueSkill,
     sort_alg = sa.HybridTrueSkill(
         data=save['sort_alg'].data,
         comparison_size=save['sort_alg'].comparison_size,
-        comparison_max=save['sort_alg'].comparison_max)
+        comparison_max=save['sort_alg'].comparison_max,
+        update_mode=getattr(save['sort_alg'], 'update_mode', "pairwise"),
+        mix_ratio=getattr(save['sort_alg'], 'mix_ratio', None))
 
     rmses = []
     prev_ratings = []
@@ -141,12 +146,9 @@ def recompute_hybridtrueskill(save: dict) -> Tuple[sa.HybridTrueSkill,
 
             if not sort_alg.is_rating:
                 if i > len(sort_alg.data):
-                    rmse = math.sqrt(
-                        sum(
-                            (prev_ratings[key].mu -
-                             sort_alg.sort_alg.ratings[key].mu)
-                            ** 2 for key in sort_alg.sort_alg.data) /
-                        sort_alg.sort_alg.n)
+                    rmse = rating_store.rmse(
+                        prev_ratings, sort_alg.sort_alg.ratings,
+                        sort_alg.sort_alg.data)
                     rmses.append(rmse)
 
                 prev_ratings = copy.deepcopy(sort_alg.sort_alg.ratings)
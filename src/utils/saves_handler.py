@@ -9,6 +9,10 @@ from typing import List, Optional, Union
 import pandas as pd
 
 import sorting_algorithms as sa
+import utils.overlap as ovl
+
+# Suffix of the file holding a memory mapped overlap matrix of a save.
+OVERLAP_SUFFIX = "_overlap.dat"
 
 
 def save_algorithm_pickle(save: dict):
@@ -58,7 +62,9 @@ def create_save(
         rating_prompt: Optional[str] = None,
         custom_rankings: Optional[List[str]] = None,
         ranking_prompt: Optional[str] = None, comp_max: Optional[int] = None,
-        min_ip: Optional[bool] = False):
+        min_ip: Optional[bool] = False, update_mode: str = "pairwise",
+        ratings_per_item: Optional[int] = None,
+        mix_ratio: Optional[float] = None):
     """
     Creates and saves the annotation item.
 
@@ -77,6 +83,15 @@ def create_save(
         comp_max (Optional[int]): The total amount of allowed comparisons.
         min_ip (Optional[bool]): Whether or not a MinIP image should be displayed next
                                  to the stacks.
+        update_mode (str): How TrueSkill updates the ratings from an ordering of
+                           more than two images, "pairwise" or "ranked".
+        ratings_per_item (Optional[int]): The number of ratings needed per image
+                                          when the images are shared between the
+                                          users, None if every user rates every
+                                          image.
+        mix_ratio (Optional[float]): The fraction of ranking comparisons mixed into
+                                     the rating phase of a hybrid save, None to
+                                     only rank after every image is rated.
     """
 
     directory = os.path.relpath(image_directory, get_application_path())
@@ -89,19 +104,6 @@ def create_save(
 
     random.shuffle(img_paths)
 
-    if algorithm == "Merge Sort":
-        sort_alg = sa.MergeSort(data=img_paths)
-    elif algorithm == "Rating":
-        sort_alg = sa.RatingAlgorithm(data=img_paths)
-    elif algorithm == "Hybrid":
-        sort_alg = sa.HybridTrueSkill(
-            data=img_paths, comparison_size=comparison_size,
-            comparison_max=comp_max)
-    else:
-        sort_alg = sa.TrueSkill(
-            data=img_paths, comparison_size=comparison_size,
-            comparison_max=comp_max)
-
     file_name = str(int(time.time()))
 
     path = get_full_path("/saves")
@@ -111,6 +113,28 @@ def create_save(
 
     path_to_save = path + "/" + file_name
 
+    if algorithm == "Merge Sort":
+        sort_alg = sa.MergeSort(
+            data=img_paths, comparison_size=comparison_size)
+    elif algorithm == "Insertion Sort":
+        sort_alg = sa.InsertionSort(data=img_paths)
+    elif algorithm == "Rating":
+        sort_alg = sa.RatingAlgorithm(
+            data=img_paths, ratings_per_item=ratings_per_item)
+    elif algorithm == "Hybrid":
+        sort_alg = sa.HybridTrueSkill(
+            data=img_paths, comparison_size=comparison_size,
+            comparison_max=comp_max,
+            overlap_path=path_to_save + OVERLAP_SUFFIX,
+            update_mode=update_mode, mix_ratio=mix_ratio)
+    else:
+        sort_alg = sa.TrueSkill(
+            data=img_paths, comparison_size=comparison_size,
+            comparison_max=comp_max,
+            overlap_storage=ovl.default_storage(len(img_paths)),
+            overlap_path=path_to_save + OVERLAP_SUFFIX,
+            update_mode=update_mode)
+
     df = pd.DataFrame(
         columns=['result', 'diff_levels', 'time', 'session', 'user',
                  'undone', 'type'])
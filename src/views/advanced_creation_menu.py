@@ -79,7 +79,8 @@ class AdvancedCreationMenu():
 
         self.algorithm_selection = ctk.CTkOptionMenu(
             master=self.basic_settings_frame,
-            values=["True Skill", "Merge Sort", "Rating", "Hybrid"],
+            values=["True Skill", "Merge Sort", "Insertion Sort", "Rating",
+                    "Hybrid"],
             width=200, height=40, font=('Helvetica bold', 20),
             command=lambda value: self.algorithm_changed())
 
@@ -112,6 +113,16 @@ class AdvancedCreationMenu():
             text="", checkbox_width=30, checkbox_height=30, onvalue=True,
             offvalue=False)
 
+        self.ranked_updates_label = ctk.CTkLabel(
+            master=self.basic_settings_frame, text="Ranked Updates:",
+            font=('Helvetica bold', 20))
+
+        self.ranked_updates = ctk.BooleanVar()
+        self.ranked_updates_checkbox = ctk.CTkCheckBox(
+            master=self.basic_settings_frame, variable=self.ranked_updates,
+            text="", checkbox_width=30, checkbox_height=30, onvalue=True,
+            offvalue=False)
+
         self.comparison_count_label = ctk.CTkLabel(
             master=self.basic_settings_frame, text="Max Total Comparisons:",
             font=('Helvetica bold', 20)
@@ -124,6 +135,26 @@ class AdvancedCreationMenu():
             validatecommand=vcmd, width=200, height=40,
             font=('Helvetica bold', 20))
 
+        self.ratings_per_item_label = ctk.CTkLabel(
+            master=self.basic_settings_frame, text="Ratings Per Image:",
+            font=('Helvetica bold', 20)
+        )
+
+        self.ratings_per_item_entry = ctk.CTkEntry(
+            master=self.basic_settings_frame, validate='key',
+            validatecommand=vcmd, width=200, height=40,
+            font=('Helvetica bold', 20))
+
+        self.mix_ratio_label = ctk.CTkLabel(
+            master=self.basic_settings_frame, text="Mixed Rankings (%):",
+            font=('Helvetica bold', 20)
+        )
+
+        self.mix_ratio_entry = ctk.CTkEntry(
+            master=self.basic_settings_frame, validate='key',
+            validatecommand=vcmd, width=200, height=40,
+            font=('Helvetica bold', 20))
+
         self.user_comparison_count_label = ctk.CTkLabel(
             master=self.basic_settings_frame, text="Max User Comparisons:",
             font=('Helvetica bold', 20)
@@ -303,6 +334,15 @@ class AdvancedCreationMenu():
             row=5, column=1, padx=10, pady=self.basic_settings_pady,
             sticky="w")
 
+        if self.should_show_update_mode():
+            self.show_update_mode()
+
+        if self.should_show_ratings_per_item():
+            self.show_ratings_per_item()
+
+        if self.should_show_mix_ratio():
+            self.show_mix_ratio()
+
         """
         self.user_comparison_count_label.grid(
             row=7, column=0, padx=10, pady=self.basic_settings_pady, sticky="e"
@@ -412,6 +452,69 @@ class AdvancedCreationMenu():
             row=6, column=1, padx=10, pady=self.basic_settings_pady,
             sticky="w")
 
+    def show_update_mode(self):
+        """
+        Displays the ranked updates label and checkbox in the basic settings frame.
+        """
+
+        self.ranked_updates_label.grid(
+            row=7, column=0, padx=10, pady=self.basic_settings_pady,
+            sticky="e")
+
+        self.ranked_updates_checkbox.grid(
+            row=7, column=1, padx=10, pady=self.basic_settings_pady,
+            sticky="w")
+
+    def show_ratings_per_item(self):
+        """
+        Displays the ratings per image label and entry in the basic settings frame.
+        """
+
+        self.ratings_per_item_label.grid(
+            row=6, column=0, padx=10, pady=self.basic_settings_pady,
+            sticky="e")
+
+        self.ratings_per_item_entry.grid(
+            row=6, column=1, padx=10, pady=self.basic_settings_pady,
+            sticky="w")
+
+    def hide_ratings_per_item(self):
+        """
+        Hides the ratings per image label and entry.
+        """
+
+        self.ratings_per_item_label.grid_remove()
+        self.ratings_per_item_entry.grid_remove()
+
+    def show_mix_ratio(self):
+        """
+        Displays the mixed rankings label and entry in the basic settings frame.
+        """
+
+        self.mix_ratio_label.grid(
+            row=8, column=0, padx=10, pady=self.basic_settings_pady,
+            sticky="e")
+
+        self.mix_ratio_entry.grid(
+            row=8, column=1, padx=10, pady=self.basic_settings_pady,
+            sticky="w")
+
+    def hide_mix_ratio(self):
+        """
+        Hides the mixed rankings label and entry.
+        """
+
+        self.mix_ratio_label.grid_remove()
+        self.mix_ratio_entry.grid_remove()
+
+    def hide_update_mode(self):
+        """
+        Hides the ranked updates label and checkbox.
+        """
+
+        self.ranked_updates_label.grid_remove()
+        self.ranked_updates_checkbox.grid_remove()
+
     def hide_rating_options(self):
         """
         Hides the rating options frame.
@@ -557,13 +660,19 @@ class AdvancedCreationMenu():
         """
 
         value = self.algorithm_selection.get()
-        if value == "Merge Sort":
+        if value == "Merge Sort" or value == "Insertion Sort":
             self.change_slider_row_state(
                 True, self.slider_frame, self.comp_label)
-            self.slider.set(2)
-            self.comparison_size_label.configure(text=2, state=ctk.DISABLED)
-            self.comp_label.configure(state=ctk.DISABLED)
-            self.slider.configure(state=ctk.DISABLED)
+            if value == "Merge Sort":
+                self.slider.configure(state=ctk.NORMAL)
+                self.comparison_size_label.configure(state=ctk.NORMAL)
+                self.comp_label.configure(state=ctk.NORMAL)
+            else:
+                self.slider.set(2)
+                self.comparison_size_label.configure(
+                    text=2, state=ctk.DISABLED)
+                self.comp_label.configure(state=ctk.DISABLED)
+                self.slider.configure(state=ctk.DISABLED)
             self.show_comparison_count()
             self.comparison_count_entry.delete(0, ctk.END)
             self.comparison_count_entry.configure(state=ctk.DISABLED)
@@ -593,6 +702,21 @@ class AdvancedCreationMenu():
         else:
             self.hide_ranking_options()
 
+        if self.should_show_update_mode():
+            self.show_update_mode()
+        else:
+            self.hide_update_mode()
+
+        if self.should_show_ratings_per_item():
+            self.show_ratings_per_item()
+        else:
+            self.hide_ratings_per_item()
+
+        if self.should_show_mix_ratio():
+            self.show_mix_ratio()
+        else:
+            self.hide_mix_ratio()
+
     def change_slider_row_state(
             self, state: bool, slider_frame: ctk.CTkFrame,
             comp_label: ctk.CTkLabel):
@@ -627,6 +751,11 @@ class AdvancedCreationMenu():
         else:
             self.hide_ranking_options()
 
+        if self.should_show_update_mode():
+            self.show_update_mode()
+        else:
+            self.hide_update_mode()
+
     def select_directory(self, root: ctk.CTkToplevel,
                          directory_var: ctk.StringVar):
         """
@@ -857,7 +986,8 @@ class AdvancedCreationMenu():
 
         compatible_algorithm = self.algorithm_selection.get(
         ) == "True Skill" or self.algorithm_selection.get(
-        ) == "Merge Sort" or self.algorithm_selection.get() == "Hybrid"
+        ) == "Merge Sort" or self.algorithm_selection.get(
+        ) == "Insertion Sort" or self.algorithm_selection.get() == "Hybrid"
 
         return compatible_algorithm
 
@@ -873,6 +1003,42 @@ class AdvancedCreationMenu():
 
         return self.algorithm_selection.get() != "Merge Sort" and self.slider.get() == 2
 
+    def should_show_update_mode(self):
+        """
+        Checks if the current selected algorithm and comparison size implies that the 
+        user should be able to choose ranked updates.
+
+        Returns:
+            bool: True if the ranked updates checkbox should be shown, False otherwise.
+        """
+
+        compatible_algorithm = self.algorithm_selection.get(
+        ) == "True Skill" or self.algorithm_selection.get() == "Hybrid"
+
+        return compatible_algorithm and self.slider.get() > 2
+
+    def should_show_ratings_per_item(self):
+        """
+        Checks if the current selected algorithm implies that the user should be able
+        to share the images between the annotators with a quota of ratings per image.
+
+        Returns:
+            bool: True if the ratings per image entry should be shown, False otherwise.
+        """
+
+        return self.algorithm_selection.get() == "Rating"
+
+    def should_show_mix_ratio(self):
+        """
+        Checks if the current selected algorithm implies that the user should be able
+        to mix ranking comparisons into the rating phase.
+
+        Returns:
+            bool: True if the mixed rankings entry should be shown, False otherwise.
+        """
+
+        return self.algorithm_selection.get() == "Hybrid"
+
     def create_save(
             self, name: ctk.StringVar, algorithm: sa.SortingAlgorithm,
             comparison_size: ctk.CTkSlider, image_directory: ctk.StringVar,
@@ -932,10 +1098,28 @@ class AdvancedCreationMenu():
             if self.ranking_prompt.get():
                 ranking_prompt = self.ranking_prompt.get()
 
+        update_mode = "pairwise"
+        if self.should_show_update_mode() and self.ranked_updates.get():
+            update_mode = "ranked"
+
+        ratings_per_item = None
+        if self.should_show_ratings_per_item() and \
+                self.ratings_per_item_entry.get().isnumeric() and \
+                int(self.ratings_per_item_entry.get()) > 0:
+            ratings_per_item = int(self.ratings_per_item_entry.get())
+
+        mix_ratio = None
+        if self.should_show_mix_ratio() and \
+                self.mix_ratio_entry.get().isnumeric() and \
+                0 < int(self.mix_ratio_entry.get()) < 100:
+            mix_ratio = int(self.mix_ratio_entry.get()) / 100
+
         saves_handler.create_save(
             name_value, alg_value, comparison_size_value, directory_value,
             scroll_enabled_value, rating_buttons, rating_prompt,
-            custom_rankings, ranking_prompt, comp_max)
+            custom_rankings, ranking_prompt, comp_max,
+            update_mode=update_mode, ratings_per_item=ratings_per_item,
+            mix_ratio=mix_ratio)
 
         self.menu_callback()
 
@@ -13,6 +13,7 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 import utils.convergence as conv
 import utils.saves_handler as saves_handler
+from utils.rating_matrix import RatingMatrix
 from widgets.pagination import Pagination
 
 
@@ -423,11 +424,7 @@ class AdvancedInformationPage():
                 values=self.custom_ratings,
                 command=lambda event: self.rating_changed(), width=160)
 
-            csv_path = saves_handler.get_path_to_save(self.save_obj) + ".csv"
-            df = pd.read_csv(csv_path, converters={"result": ast.literal_eval})
-            ratings_df = df[(df["type"] == "Rating") & (~df["undone"])]
-
-            self.ratings = ratings_df["result"].to_list()
+            self.rating_matrix = self.get_rating_matrix()
             hist_canvas_widget = self.create_histogram()
 
             self.rating_frame = Pagination(
@@ -454,6 +451,34 @@ class AdvancedInformationPage():
 
         self.tab_view.tab("Rating Distribution").columnconfigure(0, weight=1)
 
+    def get_rating_matrix(self) -> RatingMatrix:
+        """
+        Gets the ratings of all users from the sorting algorithm. Hybrid saves
+        that switched to TrueSkill before the ratings were kept are read from
+        the log instead.
+
+        Returns:
+            RatingMatrix: The ratings of all users.
+        """
+        rating_alg = self.sort_alg
+        if type(rating_alg).__name__ == "HybridTrueSkill":
+            if rating_alg.is_rating:
+                rating_alg = rating_alg.sort_alg
+            else:
+                rating_alg = getattr(rating_alg, "rating_alg", None)
+
+        if rating_alg is not None:
+            return rating_alg.get_rating_matrix()
+
+        csv_path = saves_handler.get_path_to_save(self.save_obj) + ".csv"
+        df = pd.read_csv(csv_path, converters={"result": ast.literal_eval})
+        ratings_df = df[(df["type"] == "Rating") & (~df["undone"])]
+
+        return RatingMatrix.from_ratings(
+            self.sort_alg.data,
+            [(user, key, label) for user, (key, label) in
+             zip(ratings_df["user"], ratings_df["result"])])
+
     def rating_changed(self):
         """
         Replaces the content of the list of images to match that of the currently 
@@ -463,9 +488,7 @@ class AdvancedInformationPage():
         current_selection = self.ratings_menu.get()
         current_rating = self.custom_ratings.index(current_selection)
 
-        filtered_ratings = [
-            rating[0] for rating in self.ratings
-            if rating[1] == current_rating]
+        filtered_ratings = self.rating_matrix.label_members(current_rating)
 
         self.rating_frame.change_data(
             filtered_ratings, image_label=current_rating)
@@ -597,13 +620,13 @@ class AdvancedInformationPage():
         ax.set_ylabel("Amount")
         plt.subplots_adjust(bottom=0.15)
 
-        labels = np.array([r[1] for r in self.ratings])
+        counts = self.rating_matrix.label_counts(len(self.custom_ratings))
 
         left_of_first_bin = -1/2
         right_of_last_bin = (len(self.custom_ratings) * 2 - 1) / 2
 
-        _, _, patches = plt.hist(labels, np.arange(
-            left_of_first_bin, right_of_last_bin + 1, 1),
+        _, _, patches = plt.hist(np.arange(len(counts)), np.arange(
+            left_of_first_bin, right_of_last_bin + 1, 1), weights=counts,
             edgecolor='black', linewidth=1.2)
 
         plt.xticks(range(len(self.custom_ratings)))
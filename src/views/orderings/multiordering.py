@@ -201,12 +201,15 @@ class MultiOrderingScreen(OrderingScreen):
         for i in range(len(self.int_diff_levels)):
             diff_levels_frame.columnconfigure(i, weight=1)
 
+        self.diff_level_frames = []
+
         for i, int_diff_level in enumerate(self.int_diff_levels):
 
             diff_level_frame = ctk.CTkFrame(
                 master=diff_levels_frame)
 
             diff_level_frame.grid(row=0, column=i)
+            self.diff_level_frames.append(diff_level_frame)
 
             r0 = ctk.CTkRadioButton(
                 master=diff_level_frame, variable=int_diff_level, value=0,
@@ -312,6 +315,7 @@ class MultiOrderingScreen(OrderingScreen):
         if not self.buttons_initialized:
             self.init_diff_level_buttons()
             self.buttons_initialized = True
+        self.show_used_frames(len(keys))
         self.root.update()
 
         if self.scroll_allowed:
@@ -328,6 +332,26 @@ class MultiOrderingScreen(OrderingScreen):
         if self.prev_sort_alg is not None:
             self.undo_label.place(x=20, y=70)
 
+    def show_used_frames(self, count: int):
+        """
+        Show the image frames and difference levels needed for a comparison,
+        which may hold fewer images than the comparison size.
+
+        Args:
+            count (int): The number of images in the comparison.
+        """
+        for i, image_frame in enumerate(self.image_frames):
+            if i < count:
+                image_frame.grid()
+            else:
+                image_frame.grid_remove()
+
+        for i, diff_level_frame in enumerate(self.diff_level_frames):
+            if i < count - 1:
+                diff_level_frame.grid()
+            else:
+                diff_level_frame.grid_remove()
+
     def move_left(self, index: int):
         """
         Move an image to the left in the comparison.
@@ -485,6 +509,6 @@ class MultiOrderingScreen(OrderingScreen):
         keys = [key for key, _, _ in self.images]
 
         diff_lvls = [sa.DiffLevel(int_diff_lvl.get())
-                     for int_diff_lvl in self.int_diff_levels]
+                     for int_diff_lvl in self.int_diff_levels[:len(keys) - 1]]
 
         self.submit_comparison(keys, diff_lvls)
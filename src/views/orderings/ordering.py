@@ -1,6 +1,7 @@
 import copy
 import os
 import shutil
+import threading
 import time
 from tkinter import Event
 from typing import Callable, List, Optional, Union
@@ -19,6 +20,8 @@ import utils.saves_handler as saves_handler
 from pop_outs.image_directory_pop_out import ImageDirectoryPopOut
 from pop_outs.is_finished_pop_out import IsFinishedPopOut
 from pop_outs.switching_modes_pop_out import SwitchingModesPopOut
+from pop_outs.transition_failed_pop_out import TransitionFailedPopOut
+from pop_outs.transition_progress_pop_out import TransitionProgressPopOut
 
 
 class OrderingScreen():
@@ -59,6 +62,10 @@ class OrderingScreen():
         self.prev_sort_alg = None
         self.comparison_size = self.sort_alg.comparison_size
 
+        self.phase_algorithm = None
+        if type(self.sort_alg) == sa.HybridTrueSkill:
+            self.phase_algorithm = type(self.sort_alg.get_phase_algorithm())
+
         if "min_ip" in save_obj:
             self.min_ip = save_obj["min_ip"]
         else:
@@ -90,13 +97,16 @@ class OrderingScreen():
                 self.save_obj) + '.csv')
 
         if (type(self.sort_alg) == sa.HybridTrueSkill
-                and self.hybrid_transition_made):
+                and self.hybrid_transition_made
+                and not self.sort_alg.is_rating):
 
             current_user_count = len(
                 csv_df.loc
                 [(~csv_df['undone']) & (csv_df['type'] == "Ranking")])
 
-        elif type(self.sort_alg) == sa.HybridTrueSkill:
+        elif type(self.sort_alg) == sa.HybridTrueSkill or (
+                type(self.sort_alg) == sa.RatingAlgorithm and
+                getattr(self.sort_alg, 'ratings_per_item', None)):
 
             current_user_count = len(
                 csv_df.loc[(~csv_df['undone'])])
@@ -453,6 +463,10 @@ class OrderingScreen():
             self.save_to_csv_file(keys, lvl, df_annotatation)
             self.sort_alg.inference(user, keys, lvl)
             conv.rmses_inference(self.save_obj, prev_ratings, self.sort_alg)
+        elif type(self.sort_alg) == sa.HybridTrueSkill:
+            # the ranking phase is prepared in the background below
+            self.sort_alg.inference(user, keys, lvl, transition=False)
+            self.save_to_csv_file(keys, lvl, df_annotatation)
         else:
             self.sort_alg.inference(user, keys, lvl)
             self.save_to_csv_file(keys, lvl, df_annotatation)
@@ -479,9 +493,17 @@ class OrderingScreen():
 
         self.session_elapsed_time_prev = time.time() - self.session_start_time
 
+        transitioning = False
         if not self.is_finished_check():
             if (type(self.sort_alg) == sa.HybridTrueSkill and
-                not self.sort_alg.is_rating and
+                    self.sort_alg.transition_pending()):
+
+                self.root.after_cancel(self.timer_after)
+                self.start_transition()
+                transitioning = True
+
+            elif (type(self.sort_alg) == sa.HybridTrueSkill and
+                  not self.sort_alg.is_rating and
                     not self.hybrid_transition_made):
 
                 self.root.after_cancel(self.timer_after)
@@ -489,12 +511,91 @@ class OrderingScreen():
                 self.reload_ordering_screen(self.save_obj)
                 SwitchingModesPopOut(self.root)
 
+            elif (type(self.sort_alg) == sa.HybridTrueSkill and
+                  type(self.sort_alg.get_phase_algorithm()) !=
+                    self.phase_algorithm):
+
+                # a ranking mixed into the rating phase, or the other way
+                # around, is shown on its own screen
+                self.root.after_cancel(self.timer_after)
+                self.reload_ordering_screen(self.save_obj)
+
             else:
                 self.display_new_comparison()
 
         self.is_loading = False
 
-        self.root.after(200, self.remove_submission_timeout)
+        # during a transition, submissions are allowed again once it is done
+        if not transitioning:
+            self.root.after(200, self.remove_submission_timeout)
+
+    def start_transition(self):
+        """
+        Builds the ranking phase of a hybrid annotation in a background thread,
+        while a pop-out shows that it is being prepared.
+        """
+        self.transition_pop_out = TransitionProgressPopOut(self.root)
+        self.transition_result = {}
+
+        thread = threading.Thread(
+            target=self.build_ranking_phase, daemon=True)
+        thread.start()
+
+        self.root.after(100, lambda: self.poll_transition(thread))
+
+    def build_ranking_phase(self):
+        """
+        Builds the TrueSkill model of the ranking phase. Runs in the
+        background thread, so it does not touch any widgets. Running out of
+        memory or failing to create the overlap file is recorded, any other
+        error is left to the thread.
+        """
+        try:
+            self.transition_result["sort_alg"] = \
+                self.sort_alg.build_trueskill()
+        except (MemoryError, OSError) as e:
+            self.transition_result["error"] = e
+
+    def poll_transition(self, thread: threading.Thread):
+        """
+        Starts the ranking phase once the background thread is done, and
+        otherwise checks again later. If the background build failed, the
+        annotation stays in the rating phase and the user is told.
+
+        Args:
+            thread (Thread): The thread building the ranking phase.
+        """
+        if thread.is_alive():
+            self.root.after(100, lambda: self.poll_transition(thread))
+            return
+
+        self.transition_pop_out.close()
+
+        if "sort_alg" not in self.transition_result:
+            error = self.transition_result.get("error")
+            TransitionFailedPopOut(
+                self.root,
+                "An unexpected error occurred." if error is None else
+                type(error).__name__ + ": " + str(error),
+                self.start_transition, self.leave_transition)
+            return
+
+        self.sort_alg.set_trueskill(self.transition_result["sort_alg"])
+
+        saves_handler.save_algorithm_pickle(self.save_obj)
+        self.remove_submission_timeout()
+
+        self.reload_ordering_screen(self.save_obj)
+        SwitchingModesPopOut(self.root)
+
+    def leave_transition(self):
+        """
+        Returns to the main menu after the ranking phase could not be
+        prepared. The rating phase is saved, so the annotation can be
+        continued later.
+        """
+        self.remove_submission_timeout()
+        self.back_to_menu(remove_after=False)
 
     def remove_submission_timeout(self):
         """